@@ -0,0 +1,93 @@
+# Materialised count tables for the dashboard KPIs.
+#
+# Each aggregate table holds one row per distinct combination of its group
+# columns plus a count. Triggers on the base table keep it exact on INSERT,
+# UPDATE and DELETE, so the GROUP BY queries in incidents.py / tickets.py
+# read O(groups) rows instead of scanning O(rows).
+
+# aggregate table -> (base table, group columns)
+AGGREGATES = {
+    "incident_counts": ("cyber_incidents", ("incident_type", "severity", "status")),
+    "ticket_counts": ("it_tickets", ("status", "priority", "category")),
+}
+
+
+def _match(columns, prefix):
+    """NULL-safe 'col IS NEW.col AND ...' for a trigger body."""
+    return " AND ".join(f"{c} IS {prefix}.{c}" for c in columns)
+
+
+def _increment(agg, columns, prefix):
+    cols = ", ".join(columns)
+    values = ", ".join(f"{prefix}.{c}" for c in columns)
+    return f"""
+        INSERT INTO {agg} ({cols}, count)
+        SELECT {values}, 0
+        WHERE NOT EXISTS (SELECT 1 FROM {agg} WHERE {_match(columns, prefix)});
+        UPDATE {agg} SET count = count + 1 WHERE {_match(columns, prefix)};
+    """
+
+
+def _decrement(agg, columns, prefix):
+    return f"""
+        UPDATE {agg} SET count = count - 1 WHERE {_match(columns, prefix)};
+        DELETE FROM {agg} WHERE count <= 0 AND {_match(columns, prefix)};
+    """
+
+
+def create_aggregate_tables(conn):
+    """Create every aggregate table and the triggers that maintain it (does not commit)."""
+    for agg, (table, columns) in AGGREGATES.items():
+        col_defs = ", ".join(f"{c} TEXT" for c in columns)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {agg} ({col_defs}, count INTEGER NOT NULL DEFAULT 0)")
+        conn.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS idx_{agg}_groups ON {agg} ({', '.join(columns)})")
+
+        changed = " OR ".join(f"OLD.{c} IS NOT NEW.{c}" for c in columns)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{agg}_insert AFTER INSERT ON {table}
+            BEGIN {_increment(agg, columns, "NEW")} END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{agg}_delete AFTER DELETE ON {table}
+            BEGIN {_decrement(agg, columns, "OLD")} END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{agg}_update AFTER UPDATE OF {", ".join(columns)} ON {table}
+            WHEN {changed}
+            BEGIN {_decrement(agg, columns, "OLD")} {_increment(agg, columns, "NEW")} END
+        """)
+
+
+def rebuild_aggregates(conn, names=None):
+    """Recompute aggregate tables from their base tables (does not commit)."""
+    for agg in names or AGGREGATES:
+        table, columns = AGGREGATES[agg]
+        cols = ", ".join(columns)
+        conn.execute(f"DELETE FROM {agg}")
+        conn.execute(f"INSERT INTO {agg} ({cols}, count) SELECT {cols}, COUNT(*) FROM {table} GROUP BY {cols}")
+
+
+def check_aggregates(conn, repair=False):
+    """Compare each aggregate table with a fresh GROUP BY of its base table.
+
+    Returns:
+        dict: {aggregate table: number of groups that differ}. With repair=True,
+        any table that differs is rebuilt and committed.
+    """
+    report = {}
+    for agg, (table, columns) in AGGREGATES.items():
+        cols = ", ".join(columns)
+        actual = f"SELECT {cols}, COUNT(*) FROM {table} GROUP BY {cols}"
+        stored = f"SELECT {cols}, count FROM {agg}"
+        # Groups missing/wrong on either side
+        diff_sql = f"""
+            SELECT (SELECT COUNT(*) FROM ({actual} EXCEPT {stored}))
+                 + (SELECT COUNT(*) FROM ({stored} EXCEPT {actual}))
+        """
+        report[agg] = int(conn.execute(diff_sql).fetchone()[0])
+
+    broken = [agg for agg, diff in report.items() if diff]
+    if repair and broken:
+        rebuild_aggregates(conn, broken)
+        conn.commit()
+    return report
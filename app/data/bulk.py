@@ -0,0 +1,100 @@
+import pandas as pd
+from contextlib import nullcontext
+from app.data.db import commit
+from app.data.loader import _records
+from app.data.triggers import triggers_suspended
+
+# Rows per "WHERE key IN (...)" lookup when mapping natural keys back to ids
+_LOOKUP_BATCH = 500
+
+CONFLICT_MODES = (None, "ignore", "replace", "upsert")
+
+
+def to_frame(rows, columns):
+    """Normalise bulk input to a DataFrame with exactly `columns`.
+
+    rows can be a DataFrame, or an iterable of dicts (keyed by column name) or
+    tuples (in `columns` order; short tuples are padded with None).
+    """
+    if isinstance(rows, pd.DataFrame):
+        return rows.reindex(columns=list(columns)).astype(object)
+
+    rows = list(rows)
+    if rows and isinstance(rows[0], dict):
+        return pd.DataFrame.from_records(rows, columns=list(columns)).astype(object)
+    width = len(columns)
+    padded = [tuple(r) + (None,) * (width - len(r)) for r in rows]
+    return pd.DataFrame.from_records(padded, columns=list(columns)).astype(object)
+
+
+def _insert_sql(table, columns, key, on_conflict):
+    placeholders = ", ".join("?" for _ in columns)
+    sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})"
+    others = [c for c in columns if c != key]
+    if on_conflict == "ignore":
+        sql += f" ON CONFLICT({key}) DO NOTHING"
+    elif on_conflict == "replace":
+        # Overwrite every column of the existing row (keeps its id, fires UPDATE triggers)
+        sql += f" ON CONFLICT({key}) DO UPDATE SET " + ", ".join(f"{c} = excluded.{c}" for c in others)
+    elif on_conflict == "upsert":
+        # Merge: only columns given (non-NULL) in the new row overwrite the old ones
+        sql += f" ON CONFLICT({key}) DO UPDATE SET " + ", ".join(
+            f"{c} = COALESCE(excluded.{c}, {table}.{c})" for c in others
+        )
+    return sql
+
+
+def _sequence(conn, table):
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,)).fetchone()
+    return int(row[0]) if row else 0
+
+
+def _ids_for_keys(conn, table, key, keys):
+    # Compare as text: column affinity may have turned 2000 into '2000' or back
+    found = {}
+    wanted = [k for k in dict.fromkeys(keys) if k is not None]
+    for i in range(0, len(wanted), _LOOKUP_BATCH):
+        batch = wanted[i:i + _LOOKUP_BATCH]
+        marks = ", ".join("?" for _ in batch)
+        for k, row_id in conn.execute(f"SELECT {key}, id FROM {table} WHERE {key} IN ({marks})", batch):
+            found[str(k)] = row_id
+    return [None if k is None else found.get(str(k)) for k in keys]
+
+
+def bulk_insert(conn, table, df, key, on_conflict=None, bulk=False):
+    """Write all rows of df with one executemany inside one transaction.
+
+    With bulk=True the table's per-row triggers are dropped for the write and
+    aggregates/FTS/version/change feed are caught up once afterwards (see
+    triggers.py) - worth it for very large batches only.
+
+    Returns:
+        list: the row id for each input row, in input order. With an
+        on_conflict mode the id is looked up by natural key (so 'ignore'
+        returns the id of the row that was already there); rows without a
+        key value get None.
+    """
+    if on_conflict not in CONFLICT_MODES:
+        raise ValueError(f"on_conflict must be one of {CONFLICT_MODES}")
+    if df.empty:
+        return []
+
+    columns = list(df.columns)
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN IMMEDIATE")  # lock now, so the id range below is ours alone
+    try:
+        before = _sequence(conn, table)
+        with triggers_suspended(conn, table) if bulk else nullcontext():
+            conn.executemany(_insert_sql(table, columns, key, on_conflict), _records(df))
+        if on_conflict is None:
+            ids = list(range(before + 1, _sequence(conn, table) + 1))
+        else:
+            keys = [None if pd.isna(k) else k for k in df[key]]
+            ids = _ids_for_keys(conn, table, key, keys)
+        commit(conn)
+    except Exception:
+        if own_transaction:
+            conn.rollback()
+        raise
+    return ids
@@ -0,0 +1,131 @@
+# Process-wide read cache for the data layer.
+#
+# Entries are keyed by (database file, query/function, parameters) and tagged
+# with the table_versions counter of every table they read. Writes bump those
+# counters through triggers, so an entry is only invalidated when one of *its*
+# tables has changed - a ticket update leaves cached incident charts alone.
+# Module-level state means every Streamlit session in the process shares it.
+
+import sys
+import threading
+from collections import OrderedDict
+from functools import wraps
+
+import pandas as pd
+from app.data.db import get_table_version
+
+CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+_lock = threading.Lock()
+_entries = OrderedDict()   # key -> (versions, value, size), least recently used first
+_bytes = 0
+_stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0, "bypassed": 0}
+
+
+def _freeze(value):
+    """Hashable form of query parameters (dict/list/set filter specs included)."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted((_freeze(v) for v in value), key=repr))
+    return value
+
+
+def _sizeof(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    return sys.getsizeof(value)
+
+
+def _db_file(conn):
+    return conn.execute("PRAGMA database_list").fetchone()[2]
+
+
+def _drop(key):
+    global _bytes
+    _, _, size = _entries.pop(key)
+    _bytes -= size
+
+
+def cached_call(conn, tables, fn, *args, **kwargs):
+    """Return fn(conn, *args, **kwargs), cached until one of `tables` is written.
+
+    Inside an open transaction the cache is bypassed: uncommitted writes have
+    already bumped the version and may still be rolled back.
+    Cached values are shared - treat returned DataFrames as read-only.
+    """
+    global _bytes
+    if conn.in_transaction:
+        with _lock:
+            _stats["bypassed"] += 1
+        return fn(conn, *args, **kwargs)
+
+    key = (_db_file(conn), f"{fn.__module__}.{fn.__qualname__}", _freeze(args), _freeze(kwargs))
+    versions = tuple(get_table_version(conn, t) for t in tables)
+    with _lock:
+        entry = _entries.get(key)
+        if entry is not None and entry[0] == versions:
+            _entries.move_to_end(key)
+            _stats["hits"] += 1
+            return entry[1]
+        if entry is not None:
+            _stats["stale"] += 1
+            _drop(key)
+        _stats["misses"] += 1
+
+    value = fn(conn, *args, **kwargs)
+    size = _sizeof(value)
+    if size > CACHE_MAX_BYTES:
+        return value
+
+    with _lock:
+        if key in _entries:
+            _drop(key)
+        _entries[key] = (versions, value, size)
+        _bytes += size
+        while _bytes > CACHE_MAX_BYTES:
+            _drop(next(iter(_entries)))
+            _stats["evictions"] += 1
+    return value
+
+
+def cached(*tables):
+    """Decorator for read functions taking conn first, e.g. @cached("cyber_incidents")."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(conn, *args, **kwargs):
+            return cached_call(conn, tables, fn, *args, **kwargs)
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
+
+
+def _run_query(conn, sql, params):
+    return pd.read_sql_query(sql, conn, params=params)
+
+
+def cached_query(conn, sql, params=(), tables=()):
+    """pd.read_sql_query through the cache; `tables` are the tables the SQL reads."""
+    return cached_call(conn, tables, _run_query, sql, tuple(params))
+
+
+def clear_cache():
+    """Drop every entry (normally unnecessary: writes invalidate by version)."""
+    global _bytes
+    with _lock:
+        _entries.clear()
+        _bytes = 0
+
+
+def cache_stats():
+    """Hit/miss/eviction counters plus current entry count and size."""
+    with _lock:
+        lookups = _stats["hits"] + _stats["misses"]
+        return {
+            **_stats,
+            "entries": len(_entries),
+            "bytes": _bytes,
+            "hit_rate": _stats["hits"] / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,181 @@
+# Change feed for the domain tables.
+#
+# Triggers append (seq, table, row id, op) to change_log on every INSERT,
+# UPDATE and DELETE, so a reader holding a DataFrame only has to fetch the
+# rows that changed since the seq it last saw instead of the whole table.
+# A bulk load (see triggers.py) logs a single op 'R' entry instead: the
+# whole table was reloaded.
+
+import threading
+
+import numpy as np
+import pandas as pd
+from app.data.db import commit
+from app.data.snapshots import load_table
+
+CHANGE_TABLES = ("cyber_incidents", "datasets_metadata", "it_tickets")
+
+# prune_change_log keeps this many of the newest entries
+CHANGE_LOG_KEEP = 100_000
+
+
+def create_change_log(conn):
+    """Create change_log plus the triggers that fill it (does not commit)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS change_log(
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_change_log_table_seq ON change_log(table_name, seq)")
+    for table in CHANGE_TABLES:
+        for event, ref in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_changes_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    INSERT INTO change_log (table_name, row_id, op) VALUES ('{table}', {ref}.id, '{event[0]}');
+                END
+            """)
+
+
+def latest_change(conn):
+    """Seq of the newest change to any domain table (0 if there never was one).
+
+    One primary-key lookup, so it is cheap enough to poll every few seconds.
+    """
+    row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'change_log'").fetchone()
+    return int(row[0]) if row else 0
+
+
+def _oldest_available(conn, latest):
+    row = conn.execute("SELECT MIN(seq) FROM change_log").fetchone()
+    return latest + 1 if row[0] is None else int(row[0])
+
+
+def get_changes_since(conn, table, since):
+    """Rows of `table` inserted/updated/deleted after change seq `since`.
+
+    Returns:
+        dict: {"rows": DataFrame of current versions of changed rows,
+               "deleted": [ids], "version": seq to pass next time},
+        or None if the log no longer reaches back to `since` (pruned, or a
+        different database) or the table was bulk-reloaded since then - the
+        caller should reload the whole table.
+    """
+    latest = latest_change(conn)
+    if since > latest or since + 1 < _oldest_available(conn, latest):
+        return None
+
+    changed = "SELECT row_id FROM change_log WHERE table_name = ? AND seq > ? AND seq <= ?"
+    params = (table, since, latest)
+    if conn.execute(f"{changed} AND op = 'R' LIMIT 1", params).fetchone():
+        return None
+    rows = pd.read_sql_query(
+        f"SELECT * FROM {table} WHERE id IN ({changed}) ORDER BY id DESC", conn, params=params
+    )
+    deleted = [r[0] for r in conn.execute(
+        f"SELECT DISTINCT row_id FROM change_log WHERE table_name = ? AND seq > ? AND seq <= ? "
+        f"AND row_id NOT IN (SELECT id FROM {table})",
+        params,
+    )]
+    return {"rows": rows, "deleted": deleted, "version": latest}
+
+
+def _match_dtypes(rows, like):
+    """Cast changed rows to the dtypes of the frame they patch.
+
+    The live frame may come from an Arrow snapshot and the rows from
+    read_sql, so without this concat turns columns such as incident_id or
+    reported_by into object. An integer column receiving NULLs becomes float64.
+    """
+    rows = rows.copy()
+    for col, dtype in like.dtypes.items():
+        if col not in rows or rows[col].dtype == dtype:
+            continue
+        if pd.api.types.is_integer_dtype(dtype) and rows[col].isna().any():
+            dtype = "float64"
+        try:
+            rows[col] = rows[col].astype(dtype)
+        except (TypeError, ValueError):
+            pass
+    return rows
+
+
+def apply_changes(df, changes):
+    """Patch a newest-first DataFrame with the output of get_changes_since."""
+    rows, deleted = changes["rows"], changes["deleted"]
+    if rows.empty and not deleted:
+        return df
+    rows = _match_dtypes(rows, df)
+    out = df[~df["id"].isin(set(deleted) | set(rows["id"]))]
+    if not rows.empty:
+        out = pd.concat([rows, out]) if len(out) else rows
+    return out.sort_values("id", ascending=False, ignore_index=True)
+
+
+def prune_change_log(conn, keep=CHANGE_LOG_KEEP):
+    """Delete all but the newest `keep` change_log entries. Returns rows deleted.
+
+    Readers whose seq falls before the pruned range get None from
+    get_changes_since and reload in full.
+    """
+    cursor = conn.execute("DELETE FROM change_log WHERE seq <= ?", (latest_change(conn) - keep,))
+    commit(conn)
+    return cursor.rowcount
+
+
+# -----------------------------
+# Live frames: whole tables kept in memory and patched from the change feed
+# -----------------------------
+_live_lock = threading.Lock()
+_live = {}   # (db file, table) -> (DataFrame, seq)
+_live_stats = {"full_loads": 0, "patches": 0, "rows_patched": 0}
+
+
+def get_live_frame(conn, table):
+    """A whole domain table (newest first), shared by every session in the process.
+
+    The first call reads the full table (through the Arrow snapshot when
+    there is a fresh one); later calls fetch only the rows changed since
+    then. Treat the returned DataFrame as read-only.
+    """
+    key = (conn.execute("PRAGMA database_list").fetchone()[2], table)
+    with _live_lock:
+        cached = _live.get(key)
+        changes = get_changes_since(conn, table, cached[1]) if cached else None
+        if changes is None:
+            version = latest_change(conn)
+            df = load_table(conn, table)
+            _live_stats["full_loads"] += 1
+        else:
+            df, version = apply_changes(cached[0], changes), changes["version"]
+            _live_stats["patches"] += 1
+            _live_stats["rows_patched"] += len(changes["rows"]) + len(changes["deleted"])
+        _live[key] = (df, version)
+        return df
+
+
+def frame_page(df, before_id=None, page_size=50):
+    """One keyset page of a newest-first frame, like query_builder.fetch_filtered_page.
+
+    The id column is sorted, so the cursor is found with a binary search and
+    the page is a slice: cost does not grow with how far back we page.
+
+    Returns:
+        tuple: (DataFrame, next cursor or None).
+    """
+    start = 0
+    if before_id is not None:
+        ascending = df["id"].to_numpy()[::-1]   # a view, not a copy
+        start = len(df) - int(np.searchsorted(ascending, before_id, side="left"))
+    page = df.iloc[start:start + page_size]
+    next_cursor = int(page["id"].iloc[-1]) if len(page) == page_size else None
+    return page, next_cursor
+
+
+def live_frame_stats():
+    """Full reloads vs incremental patches served by get_live_frame."""
+    return dict(_live_stats)
@@ -1,5 +1,10 @@
 import pandas as pd
-from app.data.db import connect_database
+from app.data.db import commit, connect_database
+from app.data.bulk import bulk_insert, to_frame
+from app.data.pagination import fetch_page, iter_batches
+from app.data.dtypes import compact_frame
+from app.data.cache import cached
+from app.data.query_builder import kpi_counts
 
 
 def insert_dataset(conn, dataset_name, category=None, source=None, last_updated=None, record_count=None, file_size_mb=None):
@@ -11,16 +16,49 @@ def insert_dataset(conn, dataset_name, category=None, source=None, last_updated=
         VALUES (?, ?, ?, ?, ?, ?)
     """
     cursor.execute(sql, (dataset_name, category, source, last_updated, record_count, file_size_mb))
-    conn.commit()
+    commit(conn)
     return cursor.lastrowid
 
 
-def get_all_datasets(conn):
-    """Get all datasets as a DataFrame."""
-    return pd.read_sql_query(
+# Bulk input columns, in insert_dataset's argument order
+DATASET_COLUMNS = ("dataset_name", "category", "source", "last_updated", "record_count", "file_size_mb")
+
+
+def insert_datasets(conn, rows, on_conflict=None):
+    """Insert many datasets in one transaction and return their IDs.
+
+    rows: a DataFrame, or an iterable of dicts or tuples in DATASET_COLUMNS order.
+    on_conflict: None, "ignore", "replace" or "upsert" (matched on dataset_name).
+    """
+    df = to_frame(rows, DATASET_COLUMNS)
+    return bulk_insert(conn, "datasets_metadata", df, key="dataset_name", on_conflict=on_conflict)
+
+
+def get_all_datasets(conn, compact=False):
+    """Get all datasets as a DataFrame.
+
+    compact=True returns categorical/datetime64/downcast columns instead
+    (see dtypes.compact_frame; memory before/after is in df.attrs["memory"]).
+    """
+    df = pd.read_sql_query(
         "SELECT * FROM datasets_metadata ORDER BY id DESC",
         conn
     )
+    return compact_frame(df, "datasets_metadata") if compact else df
+
+
+def get_datasets_page(conn, before_id=None, page_size=100):
+    """One page of datasets, newest first, as (DataFrame, next cursor).
+
+    Pass the returned cursor as before_id to get the next page; it is None
+    after the last page.
+    """
+    return fetch_page(conn, "datasets_metadata", before_id, page_size)
+
+
+def iter_datasets(conn, batch_size=10_000):
+    """Stream all datasets as DataFrame batches (newest first) in constant memory."""
+    return iter_batches(conn, "datasets_metadata", batch_size)
 
 
 def get_dataset_by_id(conn, dataset_id):
@@ -55,7 +93,7 @@ def update_dataset(conn, dataset_id, dataset_name, category=None, source=None, l
         WHERE id = ?
     """
     cursor.execute(sql, (dataset_name, category, source, last_updated, record_count, file_size_mb, dataset_id))
-    conn.commit()
+    commit(conn)
     return cursor.rowcount
 
 
@@ -64,11 +102,26 @@ def delete_dataset(conn, dataset_id):
     cursor = conn.cursor()
     sql = "DELETE FROM datasets_metadata WHERE id = ?"
     cursor.execute(sql, (dataset_id,))
-    conn.commit()
+    commit(conn)
     return cursor.rowcount
 
 
 
+def get_dataset_kpis(conn, filters=None):
+    """Dashboard metric tiles for a filter spec, from one SQL pass (cached).
+
+    Returns:
+        dict: total, unique_categories, unique_sources
+    """
+    kpis = kpi_counts(conn, "datasets_metadata", filters, distinct=("category", "source"))
+    return {
+        "total": kpis["total"],
+        "unique_categories": kpis["distinct"]["category"],
+        "unique_sources": kpis["distinct"]["source"],
+    }
+
+
+@cached("datasets_metadata")
 def get_datasets_by_category_count(conn):
     query = """
     SELECT category, COUNT(*) as count
@@ -79,6 +132,7 @@ def get_datasets_by_category_count(conn):
     return pd.read_sql_query(query, conn)
 
 
+@cached("datasets_metadata")
 def get_top_datasets_by_record_count(conn, limit=10):
     """Return top datasets by record_count (ignores NULL record_count)."""
     query = """
@@ -1,10 +1,209 @@
+import itertools
 import sqlite3
-import pandas as pd
-import bcrypt
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
 from pathlib import Path
 
 DB_PATH= Path("DATA")/"intelligence_platform.db"
 
-def connect_database(db_path=DB_PATH):
-    """Connect to SQL database."""
-    return sqlite3.connect(str(db_path))
\ No newline at end of file
+# PRAGMAs applied once, when the pool opens a new connection
+PRAGMAS = {
+    "journal_mode": "WAL",        # readers don't block the writer
+    "synchronous": "NORMAL",      # safe with WAL, far fewer fsyncs
+    "cache_size": -64000,         # negative = KiB, so ~64 MB page cache
+    "mmap_size": 268435456,       # 256 MB of memory-mapped reads
+    "busy_timeout": 5000,         # wait up to 5s on a locked database
+}
+
+# How many idle connections we keep per database file
+POOL_SIZE = 8
+
+_pool_lock = threading.Lock()
+_idle = defaultdict(list)          # db path -> idle PooledConnection objects
+_pool_stats = {"hits": 0, "misses": 0, "returned": 0, "discarded": 0}
+
+
+class PooledConnection(sqlite3.Connection):
+    """sqlite3 connection that goes back to the pool when closed.
+
+    Callers keep using the usual pattern (connect_database() ... conn.close()),
+    but close() only rolls back uncommitted work and parks the connection for
+    the next caller. Use close_all_connections() to really close them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.pool_key = None
+        self.checked_out = False
+
+    def close(self):
+        if self.pool_key is None:
+            super().close()
+            return
+        if not self.checked_out:
+            return  # already returned (double close)
+        if self.in_transaction:
+            self.rollback()
+        self.checked_out = False
+        _release(self)
+
+    def close_for_real(self):
+        """Close the underlying sqlite3 connection."""
+        self.pool_key = None
+        super().close()
+
+
+def _apply_pragmas(conn):
+    for name, value in PRAGMAS.items():
+        conn.execute(f"PRAGMA {name} = {value}")
+
+
+def _open(db_path, pool_key=None):
+    conn = sqlite3.connect(str(db_path), factory=PooledConnection, check_same_thread=False)
+    _apply_pragmas(conn)
+    conn.pool_key = pool_key
+    return conn
+
+
+def _release(conn):
+    with _pool_lock:
+        idle = _idle[conn.pool_key]
+        if len(idle) < POOL_SIZE:
+            idle.append(conn)
+            _pool_stats["returned"] += 1
+            return
+        _pool_stats["discarded"] += 1
+    conn.close_for_real()
+
+
+def connect_database(db_path=DB_PATH, pooled=True):
+    """Connect to SQL database.
+
+    Returns a pooled, pre-configured connection. Calling close() on it hands it
+    back to the pool instead of closing the file. Pass pooled=False to get a
+    private connection (PRAGMAs still applied) that really closes.
+    """
+    if not pooled or str(db_path) == ":memory:":
+        return _open(db_path)
+
+    key = str(Path(db_path).resolve())
+    with _pool_lock:
+        idle = _idle[key]
+        conn = idle.pop() if idle else None
+        _pool_stats["hits" if conn is not None else "misses"] += 1
+
+    if conn is None:
+        conn = _open(db_path, pool_key=key)
+    conn.checked_out = True
+    return conn
+
+
+def pool_stats():
+    """Return pool hit/miss counters plus the number of idle connections."""
+    with _pool_lock:
+        stats = dict(_pool_stats)
+        stats["idle"] = sum(len(v) for v in _idle.values())
+    total = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / total if total else 0.0
+    return stats
+
+
+def close_all_connections():
+    """Really close every idle pooled connection (e.g. before deleting the DB file)."""
+    with _pool_lock:
+        conns = [c for idle in _idle.values() for c in idle]
+        _idle.clear()
+    for conn in conns:
+        conn.close_for_real()
+
+
+def get_table_version(conn, table_name):
+    """Return the write counter for a domain table (bumped by triggers on every change)."""
+    row = conn.execute(
+        "SELECT version FROM table_versions WHERE table_name = ?", (table_name,)
+    ).fetchone()
+    return int(row[0]) if row else 0
+
+
+# -----------------------------
+# Unit of work: group many CRUD calls into one transaction / one commit
+# -----------------------------
+_units = {}                        # id(conn) -> UnitOfWork currently open on it
+_unit_stats = {"units": 0, "commits_saved": 0}
+_savepoint_ids = itertools.count(1)
+
+
+class UnitOfWork:
+    """Handle returned by unit_of_work(); counts deferred commits and makes savepoints."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.deferred_commits = 0
+
+    @contextmanager
+    def savepoint(self, name=None):
+        """Nested atomic block: on error only this block is rolled back, then the error is re-raised."""
+        name = name or f"sp_{next(_savepoint_ids)}"
+        self.conn.execute(f"SAVEPOINT {name}")
+        try:
+            yield self
+        except Exception:
+            self.conn.execute(f"ROLLBACK TO {name}")
+            self.conn.execute(f"RELEASE {name}")
+            raise
+        self.conn.execute(f"RELEASE {name}")
+
+
+def commit(conn):
+    """Commit, unless conn is inside unit_of_work() - then the commit waits for the unit to end.
+
+    The CRUD functions in incidents.py / tickets.py / datasets.py call this
+    instead of conn.commit().
+    """
+    unit = _units.get(id(conn))
+    if unit is not None:
+        unit.deferred_commits += 1
+        return
+    conn.commit()
+
+
+@contextmanager
+def unit_of_work(conn):
+    """Run several CRUD calls as one atomic transaction with a single commit.
+
+        with unit_of_work(conn) as uow:
+            insert_incident(conn, ...)
+            update_ticket_priority(conn, ticket_id, "High")
+            with uow.savepoint():
+                update_ticket_status(conn, ticket_id, "Closed")
+
+    Everything commits together at the end, or rolls back if the block
+    raises. A unit opened inside another one acts as a savepoint.
+    """
+    outer = _units.get(id(conn))
+    if outer is not None:
+        with outer.savepoint():
+            yield outer
+        return
+
+    unit = UnitOfWork(conn)
+    if not conn.in_transaction:
+        conn.execute("BEGIN")
+    _units[id(conn)] = unit
+    try:
+        yield unit
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        del _units[id(conn)]
+
+    _unit_stats["units"] += 1
+    _unit_stats["commits_saved"] += max(0, unit.deferred_commits - 1)
+
+
+def unit_of_work_stats():
+    """Units completed and commits (fsyncs) saved by deferring them."""
+    return dict(_unit_stats)
@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+# Per-table plan for compact frames: low-cardinality text -> category,
+# stored timestamps -> datetime64, INTEGER columns that may hold NULL (read
+# as float64) -> nullable Int. Integer columns are downcast.
+COMPACT_DTYPES = {
+    "cyber_incidents": {
+        "category": ("incident_type", "severity", "status", "reported_by"),
+        "datetime": ("date", "created_at"),
+        "nullable_int": ("incident_id", "date_epoch"),
+    },
+    "it_tickets": {
+        "category": ("priority", "status", "category"),
+        "datetime": ("created_date", "resolved_date", "created_at"),
+        "nullable_int": ("created_epoch", "resolved_epoch"),
+    },
+    "datasets_metadata": {
+        "category": ("category", "source"),
+        "datetime": ("last_updated", "created_at"),
+        "nullable_int": ("record_count",),
+    },
+}
+
+
+def _is_id(col):
+    # Ids keep at least 32 bits: they grow, and get merged with other frames
+    return col == "id" or col.endswith("_id")
+
+
+def _downcast_int(series):
+    out = pd.to_numeric(series, downcast="integer")
+    if _is_id(series.name) and out.dtype.itemsize < 4:
+        out = out.astype("Int32" if isinstance(out.dtype, pd.api.extensions.ExtensionDtype) else np.int32)
+    return out
+
+
+def frame_memory(df):
+    """Deep memory use of a DataFrame in bytes (object columns counted fully)."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def compact_frame(df, table, report=False):
+    """Convert a table's DataFrame to compact dtypes.
+
+    Categoricals make isin/groupby work on small integer codes instead of
+    Python strings. Timestamps that can't be parsed become NaT. Integers are
+    downcast, but id columns never below int32.
+    Memory before/after is stored in df.attrs["memory"] (and printed with report=True).
+    """
+    plan = COMPACT_DTYPES.get(table, {})
+    before = frame_memory(df)
+
+    out = df.copy()
+    for col in plan.get("category", ()):
+        if col in out:
+            out[col] = out[col].astype("category")
+    for col in plan.get("datetime", ()):
+        if col in out:
+            out[col] = pd.to_datetime(out[col], format="ISO8601", errors="coerce")
+    for col in plan.get("nullable_int", ()):
+        # INTEGER columns holding NULLs arrive as float64
+        if col in out and pd.api.types.is_float_dtype(out[col]):
+            out[col] = out[col].astype("Int64")
+    for col in out.select_dtypes(include="integer").columns:
+        out[col] = _downcast_int(out[col])
+
+    after = frame_memory(out)
+    out.attrs["memory"] = {
+        "before_bytes": before,
+        "after_bytes": after,
+        "ratio": round(before / after, 2) if after else None,
+    }
+    if report:
+        print(f"✅ {table}: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB "
+              f"({out.attrs['memory']['ratio']}x smaller)")
+    return out
@@ -1,24 +1,65 @@
 import pandas as pd
-from app.data.db import connect_database 
+from app.data.db import commit, connect_database
+from app.data.timestamps import normalise_series, to_epoch, to_iso
+from app.data.bulk import bulk_insert, to_frame
+from app.data.pagination import fetch_page, iter_batches
+from app.data.dtypes import compact_frame
+from app.data.cache import cached
+from app.data.query_builder import kpi_counts
 
 def insert_incident(conn, date, incident_type, severity, status, description, reported_by=None):
     """Insert new incident and return its ID."""
     cursor = conn.cursor()
     sql = """
         INSERT INTO cyber_incidents
-            (date, incident_type, severity, status, description, reported_by)
-        VALUES (?, ?, ?, ?, ?, ?)
+            (date, date_epoch, incident_type, severity, status, description, reported_by)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
     """
-    cursor.execute(sql, (date, incident_type, severity, status, description, reported_by))
-    conn.commit()
+    cursor.execute(sql, (to_iso(date), to_epoch(date), incident_type, severity, status, description, reported_by))
+    commit(conn)
     return cursor.lastrowid
 
-def get_all_incidents(conn):
-    """Get all incidents as a DataFrame."""
-    return pd.read_sql_query(
+# Bulk input columns: insert_incident's argument order, plus the optional CSV key
+INCIDENT_COLUMNS = ("date", "incident_type", "severity", "status", "description", "reported_by", "incident_id")
+
+
+def insert_incidents(conn, rows, on_conflict=None):
+    """Insert many incidents in one transaction and return their IDs.
+
+    rows: a DataFrame, or an iterable of dicts or tuples in INCIDENT_COLUMNS order.
+    on_conflict: None, "ignore", "replace" or "upsert" (matched on incident_id).
+    """
+    df = to_frame(rows, INCIDENT_COLUMNS)
+    df["date"], df["date_epoch"] = normalise_series(df["date"])
+    return bulk_insert(conn, "cyber_incidents", df, key="incident_id", on_conflict=on_conflict)
+
+
+def get_all_incidents(conn, compact=False):
+    """Get all incidents as a DataFrame.
+
+    compact=True returns categorical/datetime64/downcast columns instead
+    (see dtypes.compact_frame; memory before/after is in df.attrs["memory"]).
+    """
+    df = pd.read_sql_query(
         "SELECT * FROM cyber_incidents ORDER BY id DESC",
         conn
     )
+    return compact_frame(df, "cyber_incidents") if compact else df
+
+
+def get_incidents_page(conn, before_id=None, page_size=100):
+    """One page of incidents, newest first, as (DataFrame, next cursor).
+
+    Pass the returned cursor as before_id to get the next page; it is None
+    after the last page.
+    """
+    return fetch_page(conn, "cyber_incidents", before_id, page_size)
+
+
+def iter_incidents(conn, batch_size=10_000):
+    """Stream all incidents as DataFrame batches (newest first) in constant memory."""
+    return iter_batches(conn, "cyber_incidents", batch_size)
+
 
 def update_incident_status(conn, incident_id, new_status):
     """
@@ -29,7 +70,7 @@ def update_incident_status(conn, incident_id, new_status):
     cursor = conn.cursor()
     sql = "UPDATE cyber_incidents SET status = ? WHERE id = ?"
     cursor.execute(sql, (new_status, incident_id))
-    conn.commit()
+    commit(conn)
     return cursor.rowcount
 
 
@@ -42,24 +83,31 @@ def delete_incident(conn, incident_id):
     cursor = conn.cursor()
     sql = "DELETE FROM cyber_incidents WHERE id = ?"
     cursor.execute(sql, (incident_id,))
-    conn.commit()
+    commit(conn)
     return cursor.rowcount
 
 
+# The GROUP BY queries below read the trigger-maintained incident_counts table
+# (one row per type/severity/status combination), not cyber_incidents itself.
+# The triggers move both tables together, so results are cached against the
+# cyber_incidents version.
+
+@cached("cyber_incidents")
 def get_incidents_by_type_count(conn):
     query = """
-    SELECT incident_type, COUNT(*) as count
-    FROM cyber_incidents
+    SELECT incident_type, SUM(count) as count
+    FROM incident_counts
     GROUP BY incident_type
     ORDER BY count DESC
     """
     return pd.read_sql_query(query, conn)
 
 
+@cached("cyber_incidents")
 def get_high_severity_by_status(conn):
     query = """
-    SELECT status, COUNT(*) as count
-    FROM cyber_incidents
+    SELECT status, SUM(count) as count
+    FROM incident_counts
     WHERE severity = 'High'
     GROUP BY status
     ORDER BY count DESC
@@ -67,12 +115,63 @@ def get_high_severity_by_status(conn):
     return pd.read_sql_query(query, conn)
 
 
+@cached("cyber_incidents")
 def get_incident_types_with_many_cases(conn, min_count=5):
     query = """
-    SELECT incident_type, COUNT(*) as count
-    FROM cyber_incidents
+    SELECT incident_type, SUM(count) as count
+    FROM incident_counts
     GROUP BY incident_type
-    HAVING COUNT(*) > ?
+    HAVING SUM(count) > ?
     ORDER BY count DESC
     """
-    return pd.read_sql_query(query, conn, params=(min_count,))
\ No newline at end of file
+    return pd.read_sql_query(query, conn, params=(min_count,))
+
+
+def get_incident_kpis(conn, filters=None):
+    """All dashboard metric tiles for a filter spec, from one SQL pass.
+
+    filters: e.g. {"severity": ["High"], "status": ["Open", "In Progress"]}
+    (see query_builder.build_where). Cached until cyber_incidents changes.
+
+    Returns:
+        dict: total, open, high_severity, unique_types
+    """
+    kpis = kpi_counts(
+        conn, "cyber_incidents", filters,
+        counts={"open": {"status": ["Open"]}, "high_severity": {"severity": ["High"]}},
+        distinct=("incident_type",),
+    )
+    return {"total": kpis["total"], **kpis["counts"], "unique_types": kpis["distinct"]["incident_type"]}
+
+
+def get_incidents_in_range(conn, start, end):
+    """Incidents with start <= date < end (any parseable timestamps), newest first.
+
+    Uses the indexed date_epoch column instead of comparing date strings.
+    """
+    return pd.read_sql_query(
+        """
+        SELECT * FROM cyber_incidents
+        WHERE date_epoch >= ? AND date_epoch < ?
+        ORDER BY date_epoch DESC
+        """,
+        conn,
+        params=(to_epoch(start), to_epoch(end))
+    )
+
+
+@cached("cyber_incidents")
+def get_incident_counts_over_time(conn, bucket_seconds=86400, start=None, end=None):
+    """Incident counts per time bucket (default: per day), oldest bucket first."""
+    query = """
+    SELECT (date_epoch / ?) * ? AS bucket_epoch, COUNT(*) AS count
+    FROM cyber_incidents
+    WHERE date_epoch >= ? AND date_epoch < ?
+    GROUP BY bucket_epoch
+    ORDER BY bucket_epoch
+    """
+    lo = to_epoch(start) if start is not None else -(2 ** 62)
+    hi = to_epoch(end) if end is not None else 2 ** 62
+    df = pd.read_sql_query(query, conn, params=(bucket_seconds, bucket_seconds, lo, hi))
+    df["bucket"] = pd.to_datetime(df["bucket_epoch"], unit="s")
+    return df
@@ -0,0 +1,115 @@
+import hashlib
+from pathlib import Path
+
+# How many bytes we hash at the start of the file and just before the offset
+SAMPLE_BYTES = 64 * 1024
+
+
+def complete_offset(path, size=None):
+    """Return the byte offset just after the last newline-terminated line.
+
+    A writer may be half-way through appending a line, so this never counts
+    an unterminated last line; plan_ingestion decides whether it is a whole
+    record (file not being written) or a partial write to pick up next run.
+    """
+    path = Path(path)
+    size = path.stat().st_size if size is None else size
+    if size == 0:
+        return 0
+    with open(path, "rb") as f:
+        pos = size
+        while pos > 0:
+            start = max(0, pos - SAMPLE_BYTES)
+            f.seek(start)
+            block = f.read(pos - start)
+            idx = block.rfind(b"\n")
+            if idx != -1:
+                return start + idx + 1
+            pos = start
+    return 0
+
+
+def prefix_hash(path, offset):
+    """Fingerprint the first `offset` bytes of a file.
+
+    Hashing the whole prefix would make every refresh O(file size), so we hash
+    the head of the file plus the block that ends at the offset. An append
+    leaves both untouched; a rewrite or truncation almost always changes one.
+    """
+    h = hashlib.sha256()
+    h.update(str(offset).encode())
+    with open(path, "rb") as f:
+        h.update(f.read(min(offset, SAMPLE_BYTES)))
+        tail_start = max(0, offset - SAMPLE_BYTES)
+        f.seek(tail_start)
+        h.update(f.read(offset - tail_start))
+    return h.hexdigest()
+
+
+def get_ledger_entry(conn, source):
+    """Return the ledger row for a source as a dict, or None if never loaded."""
+    cur = conn.execute(
+        "SELECT file_size, mtime, sha256, byte_offset, rows_ingested FROM ingestion_ledger WHERE source = ?",
+        (source,)
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+    keys = ("file_size", "mtime", "sha256", "byte_offset", "rows_ingested")
+    return dict(zip(keys, row))
+
+
+def record_ingestion(conn, source, path, byte_offset, rows_added, complete=True):
+    """Store the file fingerprint after a successful load (does not commit).
+
+    complete=False records a mid-file checkpoint: the size is stored as -1 so
+    plan_ingestion never treats the file as unchanged and resumes from
+    byte_offset instead.
+    """
+    stat = Path(path).stat()
+    file_size = stat.st_size if complete else -1
+    conn.execute(
+        """
+        INSERT INTO ingestion_ledger (source, file_size, mtime, sha256, byte_offset, rows_ingested, loaded_at)
+        VALUES (?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT(source) DO UPDATE SET
+            file_size = excluded.file_size,
+            mtime = excluded.mtime,
+            sha256 = excluded.sha256,
+            byte_offset = excluded.byte_offset,
+            rows_ingested = ingestion_ledger.rows_ingested + excluded.rows_ingested,
+            loaded_at = excluded.loaded_at
+        """,
+        (source, file_size, stat.st_mtime, prefix_hash(path, byte_offset), byte_offset, rows_added)
+    )
+
+
+def plan_ingestion(conn, source, path):
+    """Decide what part of a source file still needs loading.
+
+    Returns:
+        tuple: (action, start_offset, end_offset) where action is one of
+        "skip" (unchanged), "append" (only new bytes) or "full" (reload
+        everything, relying on upserts to stay idempotent).
+    """
+    path = Path(path)
+    stat = path.stat()
+    end = complete_offset(path, stat.st_size)
+    if end < stat.st_size:
+        # No newline after the last line. If the file didn't change while we
+        # looked, nobody is half-way through writing it: it is a whole record.
+        after = path.stat()
+        if (after.st_size, after.st_mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            end = stat.st_size
+    entry = get_ledger_entry(conn, source)
+
+    if entry is None:
+        return "full", 0, end
+    if (entry["file_size"] == stat.st_size and entry["mtime"] == stat.st_mtime
+            and entry["byte_offset"] >= end):
+        return "skip", entry["byte_offset"], entry["byte_offset"]
+    if end >= entry["byte_offset"] and prefix_hash(path, entry["byte_offset"]) == entry["sha256"]:
+        if end == entry["byte_offset"]:
+            return "skip", end, end
+        return "append", entry["byte_offset"], end
+    return "full", 0, end
@@ -1,5 +1,22 @@
+import io
+import time
 import pandas as pd
+from contextlib import nullcontext
 from pathlib import Path
+from app.data.timestamps import normalise_series
+from app.data.ledger import get_ledger_entry, plan_ingestion, record_ingestion
+from app.data.triggers import triggers_suspended
+
+# Rows per pandas chunk in streaming mode, and rows per SQLite transaction
+DEFAULT_CHUNKSIZE = 50_000
+ROWS_PER_TRANSACTION = 500_000
+
+# Loads at least this big run with the per-row triggers dropped and rebuild
+# aggregates/FTS afterwards (see triggers.py). The rebuild reads the whole
+# table, so small appends are cheaper through the triggers.
+BULK_LOAD_MIN_BYTES = 4 * 1024 * 1024
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "DATA"
 
 
 def _table_row_count(conn, table_name: str) -> int:
@@ -9,115 +26,306 @@ def _table_row_count(conn, table_name: str) -> int:
     return int(cur.fetchone()[0])
 
 
-def load_all_csv_data(conn):
+# -----------------------------
+# Per-source column mapping (works on a whole file or on one chunk)
+# -----------------------------
+def _incidents_frame(df):
+    """cyber_incidents.csv -> cyber_incidents table.
+
+    Table schema columns:
+      incident_id, date, date_epoch, incident_type, severity, status, description, reported_by
+    CSV columns:
+      incident_id, timestamp, severity, category, status, description
+    """
+    out = pd.DataFrame()
+    out["incident_id"] = pd.to_numeric(df["incident_id"], errors="coerce")  # natural key
+    out["date"], out["date_epoch"] = normalise_series(df["timestamp"])   # timestamp -> date (ISO + epoch)
+    out["incident_type"] = df["category"].astype(str)          # category -> incident_type
+    out["severity"] = df["severity"].astype(str)
+    out["status"] = df["status"].astype(str)
+    out["description"] = df["description"].astype(str)
+    out["reported_by"] = None                                 # CSV doesn't have this
+    return out
+
+
+def _datasets_frame(df):
+    """datasets_metadata.csv -> datasets_metadata table.
+
+    Table schema columns:
+      dataset_name, category, source, last_updated, record_count, file_size_mb
+    CSV columns:
+      dataset_id, name, rows, columns, uploaded_by, upload_date
+    """
+    out = pd.DataFrame()
+    out["dataset_name"] = df["name"].astype("string")          # natural key (blank stays NULL)
+    out["category"] = None                                   # CSV doesn't have category
+    out["source"] = df["uploaded_by"].astype(str)             # use uploader as source
+    out["last_updated"] = df["upload_date"].astype(str)
+    out["record_count"] = pd.to_numeric(df["rows"], errors="coerce")
+    out["file_size_mb"] = None                               # CSV doesn't have size
+    return out
+
+
+def _tickets_frame(df):
+    """it_tickets.csv -> it_tickets table.
+
+    Table schema columns:
+      ticket_id, priority, status, category, subject, description,
+      created_date, created_epoch, resolved_date, resolved_epoch
+    CSV columns:
+      ticket_id, priority, description, status, assigned_to, created_at, resolution_time_hours
+    """
+    out = pd.DataFrame()
+    out["ticket_id"] = df["ticket_id"].astype("string")        # natural key (blank stays NULL)
+    out["priority"] = df["priority"].astype(str)
+    out["status"] = df["status"].astype(str)
+    out["category"] = df["assigned_to"].astype(str)           # simple: assign-to as category
+    out["subject"] = "Imported ticket"                         # CSV doesn't have subject
+    out["description"] = df["description"].astype(str)
+    out["created_date"], out["created_epoch"] = normalise_series(df["created_at"])
+
+    # Optional: compute a resolved_date if we have resolution_time_hours
+    created_dt = pd.to_datetime(df["created_at"], errors="coerce", format="mixed", utc=True)
+    hours = pd.to_numeric(df.get("resolution_time_hours"), errors="coerce")
+    resolved_dt = created_dt + pd.to_timedelta(hours, unit="h")
+    out["resolved_date"], out["resolved_epoch"] = normalise_series(resolved_dt)
+    return out
+
+
+# (csv file, table, column mapper) in load order
+SOURCES = [
+    ("cyber_incidents.csv", "cyber_incidents", _incidents_frame),
+    ("datasets_metadata.csv", "datasets_metadata", _datasets_frame),
+    ("it_tickets.csv", "it_tickets", _tickets_frame),
+]
+
+
+# Natural key per table: re-loading the same rows updates them instead of duplicating
+NATURAL_KEYS = {
+    "cyber_incidents": "incident_id",
+    "datasets_metadata": "dataset_name",
+    "it_tickets": "ticket_id",
+}
+
+
+def _records(out):
+    """Turn a mapped DataFrame into plain tuples for executemany (NaN -> NULL)."""
+    out = out.astype(object).where(out.notna(), None)
+    return out.itertuples(index=False, name=None)
+
+
+def drop_keyless(table, out):
+    """Drop rows whose natural key is missing.
+
+    A NULL key never conflicts in SQLite, so such a row would be inserted
+    again on every reload. Returns (rows kept, number dropped).
+    """
+    missing = out[NATURAL_KEYS[table]].isna()
+    dropped = int(missing.sum())
+    return (out[~missing] if dropped else out), dropped
+
+
+def _upsert_sql(table, columns):
+    """INSERT ... ON CONFLICT(<natural key>) DO UPDATE for the given columns."""
+    key = NATURAL_KEYS[table]
+    placeholders = ", ".join("?" for _ in columns)
+    updates = ", ".join(f"{c} = excluded.{c}" for c in columns if c != key)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+        f"ON CONFLICT({key}) DO UPDATE SET {updates}"
+    )
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of bytes [start, end) of an open binary file."""
+
+    def __init__(self, f, start, end):
+        self._f = f
+        self._f.seek(start)
+        self._remaining = max(0, end - start)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        n = min(len(b), self._remaining)
+        data = self._f.read(n)
+        b[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+def _read_frames(csv_path, start=0, end=None, chunksize=None):
+    """Yield DataFrames for the CSV rows stored in bytes [start, end).
+
+    The header line is always read from the top of the file, so an append
+    (start > 0) is parsed with the same column names as a full load.
+    """
+    end = Path(csv_path).stat().st_size if end is None else end
+    with open(csv_path, "rb") as f:
+        header = f.readline()
+        columns = list(pd.read_csv(io.BytesIO(header), nrows=0).columns)
+        start = max(start, len(header))
+        if start >= end:
+            return
+
+        stream = io.BufferedReader(_ByteRange(f, start, end))
+        if chunksize:
+            yield from pd.read_csv(stream, header=None, names=columns, chunksize=chunksize)
+        else:
+            yield pd.read_csv(stream, header=None, names=columns)
+
+
+def stream_csv_into_table(conn, frames, table, mapper, rows_per_transaction=ROWS_PER_TRANSACTION):
+    """Upsert a sequence of CSV DataFrames into a table.
+
+    Only one chunk (plus its mapped copy) is in memory at a time. Each chunk is
+    written with executemany, and we commit every rows_per_transaction rows so
+    a big file is a handful of transactions rather than one per chunk.
+
+    Returns:
+        int: rows written.
+    """
+    started = time.perf_counter()
+    rows = 0
+    pending = 0
+    skipped = 0
+
+    for chunk in frames:
+        out, dropped = drop_keyless(table, mapper(chunk))
+        skipped += dropped
+        conn.executemany(_upsert_sql(table, list(out.columns)), _records(out))
+        rows += len(out)
+        pending += len(out)
+        if pending >= rows_per_transaction:
+            conn.commit()
+            pending = 0
+
+    conn.commit()
+    elapsed = time.perf_counter() - started
+    rate = rows / elapsed if elapsed > 0 else 0.0
+    print(f"       Loaded {rows} rows into {table} ({rate:,.0f} rows/s)")
+    if skipped:
+        print(f"⚠️     Skipped {skipped} {table} rows with no {NATURAL_KEYS[table]}")
+    return rows
+
+
+def backfill_natural_keys(conn, table, csv_path, mapper):
+    """Give keyless rows written by the pre-ledger loader their natural key (does not commit).
+
+    That loader appended each file to an empty table without its key, so CSV
+    row k became row id k. A row is only matched if its description (where
+    the table has one) agrees too; rows created later through CRUD keep a
+    NULL key. Without this a full reload would insert every old row again.
+
+    Returns:
+        int: rows updated.
+    """
+    key = NATURAL_KEYS[table]
+    if conn.execute(f"SELECT 1 FROM {table} WHERE {key} IS NULL LIMIT 1").fetchone() is None:
+        return 0
+
+    updated = 0
+    row_id = 0
+    for chunk in _read_frames(csv_path, chunksize=DEFAULT_CHUNKSIZE):
+        out = mapper(chunk)
+        out.insert(0, "id", range(row_id + 1, row_id + len(out) + 1))
+        row_id += len(out)
+        out = out[out[key].notna()]
+
+        columns = [key, "id"] + (["description"] if "description" in out else [])
+        sql = f"UPDATE OR IGNORE {table} SET {key} = ? WHERE id = ? AND {key} IS NULL"
+        if "description" in out:
+            sql += " AND description IS ?"
+        cursor = conn.executemany(sql, _records(out[columns]))
+        updated += max(cursor.rowcount, 0)
+    return updated
+
+
+def prepare_source(conn, csv_name, csv_path, table, mapper):
+    """Check the ledger for one source and print what we are going to do.
+
+    Returns:
+        tuple | None: (start, end) byte range still to load, or None to skip.
+    """
+    if get_ledger_entry(conn, csv_name) is None and _table_row_count(conn, table) > 0:
+        # Loaded by an older version (before the ledger existed): adopt the
+        # file as-is, filling in the natural keys that loader didn't store
+        _, _, end = plan_ingestion(conn, csv_name, csv_path)
+        keyed = backfill_natural_keys(conn, table, csv_path, mapper)
+        record_ingestion(conn, csv_name, csv_path, end, 0)
+        conn.commit()
+        print(f"       Skipping {table} (table already has data, now tracked in ledger)")
+        if keyed:
+            print(f"       Filled in {NATURAL_KEYS[table]} for {keyed} existing {table} rows")
+        return None
+
+    action, start, end = plan_ingestion(conn, csv_name, csv_path)
+    if action == "full":
+        # Tables adopted before keys were backfilled: key them before upserting
+        keyed = backfill_natural_keys(conn, table, csv_path, mapper)
+        conn.commit()
+        if keyed:
+            print(f"       Filled in {NATURAL_KEYS[table]} for {keyed} existing {table} rows")
+    if action == "skip":
+        print(f"       Skipping {table} (unchanged since last load)")
+        return None
+    if action == "append":
+        print(f"       {csv_name} grew: loading {end - start:,} new bytes")
+    return start, end
+
+
+def use_bulk_load(start, end, bulk=None):
+    """Whether loading bytes [start, end) should skip the per-row triggers.
+
+    bulk=None decides by size; True/False forces it.
+    """
+    return end - start >= BULK_LOAD_MIN_BYTES if bulk is None else bulk
+
+
+def load_all_csv_data(conn, chunksize=None, data_dir=DATA_DIR, bulk=None):
     """Load the 3 coursework CSV files into the 3 SQLite tables.
 
     This version is intentionally *simple*:
     - Read CSV with pandas
     - Build a NEW DataFrame that matches the table schema columns exactly
-    - Append into SQLite with df.to_sql(...)
+    - Upsert into SQLite with executemany (keyed on incident_id / ticket_id /
+      dataset_name, so loading the same rows twice never duplicates them;
+      rows without a key are skipped)
 
-    It also SKIPS loading if a table already has data (prevents duplicates).
+    Pass chunksize (e.g. DEFAULT_CHUNKSIZE) to stream each file in chunks
+    instead, which keeps memory bounded for very large exports.
+
+    Each file's size, mtime, hash and byte offset are kept in the
+    ingestion_ledger table. Unchanged files are skipped, appended files only
+    load the new rows, and rewritten files are re-upserted in full.
+
+    Loads of BULK_LOAD_MIN_BYTES or more (or any load with bulk=True) skip
+    the per-row triggers and rebuild the derived tables once at the end.
 
     Returns:
         int: total number of rows loaded across all tables.
     """
 
     total_rows = 0
-    base_path = Path(__file__).resolve().parents[2] / "DATA"
-
-    # -----------------------------
-    # 1) cyber_incidents.csv  -> cyber_incidents table
-    # Table schema columns:
-    #   date, incident_type, severity, status, description, reported_by
-    # CSV columns:
-    #   incident_id, timestamp, severity, category, status, description
-    # -----------------------------
-    if _table_row_count(conn, "cyber_incidents") == 0:
-        cyber_csv = base_path / "cyber_incidents.csv"
-        if cyber_csv.exists():
-            df = pd.read_csv(cyber_csv)
-
-            # Build schema-matching DataFrame
-            out = pd.DataFrame()
-            out["date"] = df["timestamp"].astype(str)                 # timestamp -> date
-            out["incident_type"] = df["category"].astype(str)          # category -> incident_type
-            out["severity"] = df["severity"].astype(str)
-            out["status"] = df["status"].astype(str)
-            out["description"] = df["description"].astype(str)
-            out["reported_by"] = None                                 # CSV doesn't have this
-
-            out.to_sql("cyber_incidents", conn, if_exists="append", index=False)
-            total_rows += len(out)
-            print(f"       Loaded {len(out)} rows into cyber_incidents")
-        else:
-            print("       cyber_incidents.csv not found in DATA/")
-    else:
-        print("       Skipping cyber_incidents (table already has data)")
-
-    # -----------------------------
-    # 2) datasets_metadata.csv -> datasets_metadata table
-    # Table schema columns:
-    #   dataset_name, category, source, last_updated, record_count, file_size_mb
-    # CSV columns:
-    #   dataset_id, name, rows, columns, uploaded_by, upload_date
-    # -----------------------------
-    if _table_row_count(conn, "datasets_metadata") == 0:
-        datasets_csv = base_path / "datasets_metadata.csv"
-        if datasets_csv.exists():
-            df = pd.read_csv(datasets_csv)
-
-            out = pd.DataFrame()
-            out["dataset_name"] = df["name"].astype(str)
-            out["category"] = None                                   # CSV doesn't have category
-            out["source"] = df["uploaded_by"].astype(str)             # use uploader as source
-            out["last_updated"] = df["upload_date"].astype(str)
-            out["record_count"] = pd.to_numeric(df["rows"], errors="coerce")
-            out["file_size_mb"] = None                               # CSV doesn't have size
-
-            out.to_sql("datasets_metadata", conn, if_exists="append", index=False)
-            total_rows += len(out)
-            print(f"       Loaded {len(out)} rows into datasets_metadata")
-        else:
-            print("       datasets_metadata.csv not found in DATA/")
-    else:
-        print("       Skipping datasets_metadata (table already has data)")
-
-    # -----------------------------
-    # 3) it_tickets.csv -> it_tickets table
-    # Table schema columns:
-    #   ticket_id, priority, status, category, subject, description,
-    #   created_date, resolved_date
-    # CSV columns:
-    #   ticket_id, priority, description, status, assigned_to, created_at, resolution_time_hours
-    # -----------------------------
-    if _table_row_count(conn, "it_tickets") == 0:
-        tickets_csv = base_path / "it_tickets.csv"
-        if tickets_csv.exists():
-            df = pd.read_csv(tickets_csv)
-
-            out = pd.DataFrame()
-            out["ticket_id"] = df["ticket_id"].astype(str)
-            out["priority"] = df["priority"].astype(str)
-            out["status"] = df["status"].astype(str)
-            out["category"] = df["assigned_to"].astype(str)           # simple: assign-to as category
-            out["subject"] = "Imported ticket"                         # CSV doesn't have subject
-            out["description"] = df["description"].astype(str)
-            out["created_date"] = df["created_at"].astype(str)
-
-            # Optional: compute a resolved_date if we have resolution_time_hours
-            created_dt = pd.to_datetime(df["created_at"], errors="coerce")
-            hours = pd.to_numeric(df.get("resolution_time_hours"), errors="coerce")
-            resolved_dt = created_dt + pd.to_timedelta(hours, unit="h")
-            out["resolved_date"] = resolved_dt.dt.strftime("%Y-%m-%d %H:%M:%S")
-
-            out.to_sql("it_tickets", conn, if_exists="append", index=False)
-            total_rows += len(out)
-            print(f"       Loaded {len(out)} rows into it_tickets")
-        else:
-            print("       it_tickets.csv not found in DATA/")
-    else:
-        print("       Skipping it_tickets (table already has data)")
+    for csv_name, table, mapper in SOURCES:
+        csv_path = Path(data_dir) / csv_name
+        if not csv_path.exists():
+            print(f"       {csv_name} not found in {data_dir}")
+            continue
+
+        byte_range = prepare_source(conn, csv_name, csv_path, table, mapper)
+        if byte_range is None:
+            continue
+        start, end = byte_range
+
+        frames = _read_frames(csv_path, start, end, chunksize=chunksize)
+        bulk_load = use_bulk_load(start, end, bulk)
+        with triggers_suspended(conn, table) if bulk_load else nullcontext():
+            rows = stream_csv_into_table(conn, frames, table, mapper)
+        record_ingestion(conn, csv_name, csv_path, end, rows)
+        conn.commit()
+        total_rows += rows
+
+    return total_rows
 
-    conn.commit()
-    return total_rows
\ No newline at end of file
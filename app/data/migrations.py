@@ -0,0 +1,142 @@
+# Versioned schema migrations.
+#
+# The schema version lives in SQLite's PRAGMA user_version. Each migration runs
+# once, in its own transaction together with the version bump, and is safe on
+# a database that already has the change (fresh databases get most columns
+# straight from CREATE TABLE in schema.py).
+#
+# To change the schema, append a new (version, description, function) entry to
+# MIGRATIONS; never edit one that has shipped.
+
+from app.data.aggregates import create_aggregate_tables, rebuild_aggregates
+from app.data.changes import create_change_log
+from app.data.search import create_search_indexes
+from app.data.triggers import create_suspended_triggers_table
+
+
+def _add_column_if_missing(conn, table, column, decl):
+    """ALTER TABLE ... ADD COLUMN, but only if the column isn't there yet."""
+    cols = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+    if column not in cols:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _m001_incident_natural_key(conn):
+    # incident_id from the CSV export, so re-loading a file is idempotent
+    _add_column_if_missing(conn, "cyber_incidents", "incident_id", "INTEGER")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_incidents_incident_id ON cyber_incidents(incident_id)"
+    )
+
+
+# (table, text column, epoch column, index name) kept in sync by the loader and CRUD helpers
+TIMESTAMP_COLUMNS = (
+    ("cyber_incidents", "date", "date_epoch", "idx_incidents_date_epoch"),
+    ("it_tickets", "created_date", "created_epoch", "idx_tickets_created_epoch"),
+    ("it_tickets", "resolved_date", "resolved_epoch", "idx_tickets_resolved_epoch"),
+)
+
+
+def _m002_typed_timestamps(conn):
+    # Normalise old free-form text to ISO-8601 and fill the epoch columns.
+    # Text SQLite can't parse (e.g. 'nan') is left as it is.
+    for table, text_col, epoch_col, index_name in TIMESTAMP_COLUMNS:
+        _add_column_if_missing(conn, table, epoch_col, "INTEGER")
+        conn.execute(f"""
+            UPDATE {table}
+            SET {text_col} = strftime('%Y-%m-%d %H:%M:%S', {text_col}),
+                {epoch_col} = CAST(strftime('%s', {text_col}) AS INTEGER)
+            WHERE {epoch_col} IS NULL AND strftime('%s', {text_col}) IS NOT NULL
+        """)
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table}({epoch_col})")
+
+
+def _m003_query_indexes(conn):
+    # Chosen for the real query set in incidents.py / tickets.py / datasets.py
+    # and the dashboard filters
+    statements = [
+        # get_high_severity_by_status (WHERE severity GROUP BY status) and the
+        # severity/status/type filters, answered from the index alone
+        "CREATE INDEX IF NOT EXISTS idx_incidents_severity_status ON cyber_incidents(severity, status, incident_type)",
+        # get_incidents_by_type_count / get_incident_types_with_many_cases
+        "CREATE INDEX IF NOT EXISTS idx_incidents_type ON cyber_incidents(incident_type)",
+        # get_tickets_by_status_count and the status/priority filters
+        "CREATE INDEX IF NOT EXISTS idx_tickets_status_priority ON it_tickets(status, priority)",
+        "CREATE INDEX IF NOT EXISTS idx_tickets_priority ON it_tickets(priority)",
+        "CREATE INDEX IF NOT EXISTS idx_tickets_category ON it_tickets(category)",
+        # get_datasets_by_category_count / get_top_datasets_by_record_count
+        "CREATE INDEX IF NOT EXISTS idx_datasets_category ON datasets_metadata(category)",
+        "CREATE INDEX IF NOT EXISTS idx_datasets_record_count ON datasets_metadata(record_count)",
+    ]
+    for sql in statements:
+        conn.execute(sql)
+
+
+def _m004_aggregate_tables(conn):
+    # Trigger-maintained counts for the dashboard KPIs (see aggregates.py)
+    create_aggregate_tables(conn)
+    rebuild_aggregates(conn)
+
+
+def _m005_search_indexes(conn):
+    # FTS5 over incident descriptions and ticket subject/description (see search.py)
+    create_search_indexes(conn)
+
+
+def _m006_change_log(conn):
+    # Per-row change feed for incremental refreshes (see changes.py)
+    create_change_log(conn)
+
+
+def _m007_suspended_triggers(conn):
+    # Trigger SQL saved while a bulk load runs without triggers (see triggers.py)
+    create_suspended_triggers_table(conn)
+
+
+MIGRATIONS = [
+    (1, "incident_id natural key", _m001_incident_natural_key),
+    (2, "ISO-8601 timestamps + epoch columns", _m002_typed_timestamps),
+    (3, "indexes for dashboard queries", _m003_query_indexes),
+    (4, "trigger-maintained aggregate count tables", _m004_aggregate_tables),
+    (5, "FTS5 full-text search indexes", _m005_search_indexes),
+    (6, "change_log feed for incremental refresh", _m006_change_log),
+    (7, "suspended_triggers table for bulk loads", _m007_suspended_triggers),
+]
+
+
+def get_schema_version(conn):
+    """Return the schema version stored in the database (0 = never migrated)."""
+    return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def run_migrations(conn):
+    """Apply every migration newer than the database's schema version.
+
+    Runs ANALYZE afterwards so the query planner knows about new indexes.
+
+    Returns:
+        int: number of migrations applied.
+    """
+    if conn.in_transaction:
+        conn.commit()
+
+    current = get_schema_version(conn)
+    applied = 0
+    for version, description, migrate in MIGRATIONS:
+        if version <= current:
+            continue
+        conn.execute("BEGIN")
+        try:
+            migrate(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        applied += 1
+        print(f"✅ Applied migration {version}: {description}")
+
+    if applied:
+        conn.execute("ANALYZE")
+        conn.commit()
+    return applied
@@ -0,0 +1,43 @@
+import pandas as pd
+
+# Keyset ("seek") pagination: each page starts below the last id of the previous
+# one (WHERE id < ?), so page 10,000 costs the same as page 1, unlike OFFSET.
+
+
+def fetch_page(conn, table, before_id=None, page_size=100):
+    """One page of a table, newest (highest id) first.
+
+    Args:
+        before_id: cursor from the previous page; None for the first page.
+        page_size: rows per page.
+
+    Returns:
+        tuple: (DataFrame, next cursor). The cursor is None on the last page.
+    """
+    if before_id is None:
+        df = pd.read_sql_query(
+            f"SELECT * FROM {table} ORDER BY id DESC LIMIT ?", conn, params=(page_size,)
+        )
+    else:
+        df = pd.read_sql_query(
+            f"SELECT * FROM {table} WHERE id < ? ORDER BY id DESC LIMIT ?",
+            conn,
+            params=(int(before_id), page_size)
+        )
+    next_cursor = int(df["id"].iloc[-1]) if len(df) == page_size else None
+    return df, next_cursor
+
+
+def iter_batches(conn, table, batch_size=10_000, before_id=None):
+    """Yield a table as DataFrames of at most batch_size rows, newest first.
+
+    Only one batch is held at a time, so memory stays flat however big the
+    table is.
+    """
+    cursor = before_id
+    while True:
+        df, cursor = fetch_page(conn, table, cursor, batch_size)
+        if not df.empty:
+            yield df
+        if cursor is None:
+            return
@@ -0,0 +1,188 @@
+import os
+import queue
+import time
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+
+from app.data.ledger import record_ingestion
+from app.data.triggers import resume_triggers, suspend_triggers
+from app.data.loader import (
+    DATA_DIR,
+    DEFAULT_CHUNKSIZE,
+    ROWS_PER_TRANSACTION,
+    SOURCES,
+    _read_frames,
+    _records,
+    _upsert_sql,
+    NATURAL_KEYS,
+    drop_keyless,
+    prepare_source,
+    use_bulk_load,
+)
+
+# Max chunks waiting for the writer; bounds memory when parsing outruns SQLite
+QUEUE_SIZE = 8
+
+_MAPPERS = {csv_name: (table, mapper) for csv_name, table, mapper in SOURCES}
+
+
+def _put(out_queue, cancel, item):
+    """Queue item for the writer; False if the load was cancelled while waiting."""
+    while not cancel.is_set():
+        try:
+            out_queue.put(item, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _parse_source(csv_name, csv_path, start, end, chunksize, out_queue, cancel):
+    """Worker process: parse + transform one CSV and push chunks to the writer.
+
+    Each message is (csv_name, columns, records). The last message for a
+    source is (csv_name, None, {"parse": seconds, "transform": seconds,
+    "skipped": rows dropped for having no natural key}). Stops early once
+    `cancel` is set.
+    """
+    table, mapper = _MAPPERS[csv_name]
+    timings = {"parse": 0.0, "transform": 0.0, "skipped": 0}
+    frames = _read_frames(csv_path, start, end, chunksize=chunksize)
+
+    while not cancel.is_set():
+        t0 = time.perf_counter()
+        chunk = next(frames, None)
+        t1 = time.perf_counter()
+        timings["parse"] += t1 - t0
+        if chunk is None:
+            break
+
+        out, dropped = drop_keyless(table, mapper(chunk))
+        timings["skipped"] += dropped
+        records = list(_records(out))
+        timings["transform"] += time.perf_counter() - t1
+        if not _put(out_queue, cancel, (csv_name, list(out.columns), records)):
+            return
+
+    _put(out_queue, cancel, (csv_name, None, timings))
+
+
+def _raise_worker_errors(futures):
+    for future in futures:
+        if future.done() and future.exception() is not None:
+            raise future.exception()
+
+
+def _cancel_workers(cancel, chunks, futures):
+    """Tell the workers to stop and empty the queue until they have exited.
+
+    Without this a worker blocked on a full queue never returns, and leaving
+    the ProcessPoolExecutor block waits for it forever.
+    """
+    cancel.set()
+    while not all(future.done() for future in futures):
+        try:
+            chunks.get(timeout=0.1)
+        except queue.Empty:
+            pass
+
+
+def run_ingestion_pipeline(conn, chunksize=DEFAULT_CHUNKSIZE, workers=None, data_dir=DATA_DIR, bulk=None):
+    """Load the 3 CSVs in parallel: one parse/transform process per source,
+    one SQLite writer.
+
+    Worker processes parse and map their file chunk by chunk and feed a
+    bounded queue. The calling thread is the only writer: it upserts each
+    chunk on `conn`, commits every ROWS_PER_TRANSACTION rows and updates the
+    ingestion ledger when a source finishes. Wall-clock time is roughly that
+    of the slowest file instead of the sum of all three. Big sources load
+    with their per-row triggers dropped, as in load_all_csv_data.
+
+    Returns:
+        dict: {table: {"rows", "skipped", "parse", "transform", "write"}}
+        (timings in seconds).
+    """
+    started = time.perf_counter()
+    jobs = []
+    for csv_name, table, mapper in SOURCES:
+        csv_path = Path(data_dir) / csv_name
+        if not csv_path.exists():
+            print(f"       {csv_name} not found in {data_dir}")
+            continue
+        byte_range = prepare_source(conn, csv_name, csv_path, table, mapper)
+        if byte_range is not None:
+            jobs.append((csv_name, csv_path, byte_range))
+
+    stats = {}
+    if not jobs:
+        return stats
+
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    bulk_tables = [
+        _MAPPERS[csv_name][0] for csv_name, _, (start, end) in jobs if use_bulk_load(start, end, bulk)
+    ]
+    for table in bulk_tables:
+        suspend_triggers(conn, table)
+    try:
+        with Manager() as manager, ProcessPoolExecutor(max_workers=workers) as pool:
+            chunks = manager.Queue(maxsize=QUEUE_SIZE)
+            cancel = manager.Event()
+            futures = [
+                pool.submit(_parse_source, csv_name, str(csv_path), start, end, chunksize, chunks, cancel)
+                for csv_name, csv_path, (start, end) in jobs
+            ]
+            paths = {csv_name: csv_path for csv_name, csv_path, _ in jobs}
+            ends = {csv_name: end for csv_name, _, (_, end) in jobs}
+            for csv_name, _, _ in jobs:
+                table, _ = _MAPPERS[csv_name]
+                stats[table] = {"rows": 0, "parse": 0.0, "transform": 0.0, "write": 0.0}
+
+            try:
+                remaining = len(jobs)
+                pending = 0
+                while remaining:
+                    try:
+                        csv_name, columns, payload = chunks.get(timeout=0.5)
+                    except queue.Empty:
+                        _raise_worker_errors(futures)
+                        continue
+
+                    table, _ = _MAPPERS[csv_name]
+                    t0 = time.perf_counter()
+                    if columns is None:
+                        # Source finished: catch up its triggers, flush it and move
+                        # its ledger offset forward
+                        resume_triggers(conn, [table])
+                        record_ingestion(conn, csv_name, paths[csv_name], ends[csv_name], stats[table]["rows"])
+                        conn.commit()
+                        pending = 0
+                        stats[table].update(payload)
+                        remaining -= 1
+                    else:
+                        conn.executemany(_upsert_sql(table, columns), payload)
+                        stats[table]["rows"] += len(payload)
+                        pending += len(payload)
+                        if pending >= ROWS_PER_TRANSACTION:
+                            conn.commit()
+                            pending = 0
+                    stats[table]["write"] += time.perf_counter() - t0
+
+                _raise_worker_errors(futures)
+            except BaseException:
+                # Writer or worker failed: stop the other workers before the
+                # with-block waits for them
+                _cancel_workers(cancel, chunks, futures)
+                raise
+    finally:
+        # No-op for tables already resumed when their source finished
+        resume_triggers(conn, bulk_tables)
+
+    elapsed = time.perf_counter() - started
+    print(f"       {'Table':<20} {'Rows':>10} {'Parse s':>9} {'Transform s':>12} {'Write s':>9}")
+    for table, s in stats.items():
+        print(f"       {table:<20} {s['rows']:>10} {s['parse']:>9.2f} {s['transform']:>12.2f} {s['write']:>9.2f}")
+        if s.get("skipped"):
+            print(f"⚠️     Skipped {s['skipped']} {table} rows with no {NATURAL_KEYS[table]}")
+    print(f"       Pipeline finished in {elapsed:.2f}s")
+    return stats
@@ -0,0 +1,193 @@
+import pandas as pd
+from app.data.aggregates import AGGREGATES
+from app.data.cache import cached_call
+
+# Columns each table may be filtered on. Column names end up in the SQL text,
+# so anything not listed here is rejected.
+FILTER_COLUMNS = {
+    "cyber_incidents": ("severity", "status", "incident_type"),
+    "it_tickets": ("priority", "status", "category"),
+    "datasets_metadata": ("category", "source"),
+}
+
+
+def _check(table, columns):
+    allowed = FILTER_COLUMNS.get(table, ())
+    bad = [c for c in columns if c not in allowed]
+    if bad:
+        raise ValueError(f"Cannot filter {table} on {bad}; allowed: {allowed}")
+
+
+def _conditions(table, filters):
+    """(clauses, params) for a filter spec; one clause per filtered column."""
+    filters = {c: list(v) for c, v in (filters or {}).items() if v}
+    _check(table, filters)
+
+    clauses, params = [], []
+    for column, values in filters.items():
+        non_null = [v for v in values if v is not None]
+        parts = []
+        if non_null:
+            parts.append(f"{column} IN ({', '.join('?' for _ in non_null)})")
+            params.extend(non_null)
+        if len(non_null) < len(values):
+            parts.append(f"{column} IS NULL")
+        clauses.append("(" + " OR ".join(parts) + ")")
+    return clauses, params
+
+
+def build_where(table, filters):
+    """Turn a filter spec into a parameterised WHERE clause.
+
+    filters maps column -> list of allowed values, e.g.
+    {"severity": ["High", "Critical"], "status": ["Open"]}. An empty or
+    missing list means "no filter on that column" (same as the dashboard
+    multiselects). None in a list matches NULL.
+
+    Returns:
+        tuple: (sql, params) where sql is "" or "WHERE ...".
+    """
+    clauses, params = _conditions(table, filters)
+    return ("WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+
+def _count_source(table, columns):
+    """Read counts from the aggregate table when it has every column we need."""
+    for agg, (base, group_cols) in AGGREGATES.items():
+        if base == table and set(columns) <= set(group_cols):
+            return agg, "SUM(count)"
+    return table, "COUNT(*)"
+
+
+def fetch_filtered_page(conn, table, filters, before_id=None, page_size=50):
+    """One keyset page of the rows matching filters, newest first.
+
+    Returns:
+        tuple: (DataFrame, next cursor or None).
+    """
+    where, params = build_where(table, filters)
+    if before_id is not None:
+        where = (where + " AND " if where else "WHERE ") + "id < ?"
+        params.append(int(before_id))
+    df = pd.read_sql_query(
+        f"SELECT * FROM {table} {where} ORDER BY id DESC LIMIT ?",
+        conn,
+        params=(*params, page_size)
+    )
+    next_cursor = int(df["id"].iloc[-1]) if len(df) == page_size else None
+    return df, next_cursor
+
+
+def count_filtered(conn, table, filters):
+    """Number of rows matching filters (O(groups) when an aggregate table covers them)."""
+    source, expr = _count_source(table, [c for c, v in (filters or {}).items() if v])
+    where, params = build_where(table, filters)
+    value = conn.execute(f"SELECT {expr} FROM {source} {where}", params).fetchone()[0]
+    return int(value or 0)
+
+
+def grouped_counts(conn, table, filters, column):
+    """Counts per value of `column` among rows matching filters, largest first (cached)."""
+    return cached_call(conn, (table,), _grouped_counts, table, _normalise(filters), column)
+
+
+def _grouped_counts(conn, table, filters, column):
+    _check(table, [column])
+    source, expr = _count_source(table, [column] + [c for c, v in (filters or {}).items() if v])
+    where, params = build_where(table, filters)
+    return pd.read_sql_query(
+        f"SELECT {column}, {expr} AS count FROM {source} {where} GROUP BY {column} ORDER BY count DESC",
+        conn,
+        params=params
+    )
+
+
+def distinct_values(conn, table, column):
+    """Sorted distinct non-NULL values of a filter column (for multiselect options, cached)."""
+    return cached_call(conn, (table,), _distinct_values, table, column)
+
+
+def _distinct_values(conn, table, column):
+    _check(table, [column])
+    source, _ = _count_source(table, [column])
+    rows = conn.execute(
+        f"SELECT DISTINCT {column} FROM {source} WHERE {column} IS NOT NULL ORDER BY {column}"
+    ).fetchall()
+    return [r[0] for r in rows]
+
+
+def _normalise(filters):
+    """Order-independent filter spec, so equal filters share a cache entry."""
+    return {c: sorted(set(v), key=repr) for c, v in (filters or {}).items() if v}
+
+
+# -----------------------------
+# KPI tiles: every number from one SQL pass
+# -----------------------------
+def kpi_counts(conn, table, filters, counts=None, distinct=()):
+    """Filtered total, conditional counts and distinct counts in a single query.
+
+    Args:
+        filters: filter spec (see build_where).
+        counts: optional {name: extra filter spec}; each is counted within
+            filters, e.g. {"open": {"status": ["Open"]}}.
+        distinct: columns whose distinct non-NULL values are counted.
+
+    Returns:
+        dict: {"total": int, "counts": {name: int}, "distinct": {column: int}}
+
+    Results go through app.data.cache, so a repeat view only costs the
+    table_versions lookup until the table is written to again.
+    """
+    counts = {name: _normalise(extra) for name, extra in (counts or {}).items()}
+    return cached_call(conn, (table,), _kpi_counts, table, _normalise(filters), counts, tuple(distinct))
+
+
+def _kpi_counts(conn, table, filters, counts, distinct):
+    _check(table, distinct)
+    used = [c for c, v in (filters or {}).items() if v] + list(distinct)
+    for extra in counts.values():
+        used += [c for c, v in extra.items() if v]
+    source, total_expr = _count_source(table, used)
+    weight = "count" if total_expr == "SUM(count)" else "1"
+
+    select, select_params = [total_expr], []
+    for extra in counts.values():
+        clauses, params = _conditions(table, extra)
+        condition = " AND ".join(clauses) or "1"
+        select.append(f"SUM(CASE WHEN {condition} THEN {weight} ELSE 0 END)")
+        select_params += params
+    select += [f"COUNT(DISTINCT {c})" for c in distinct]
+
+    where, where_params = build_where(table, filters)
+    row = conn.execute(
+        f"SELECT {', '.join(select)} FROM {source} {where}", select_params + where_params
+    ).fetchone()
+    values = [int(v or 0) for v in row]
+
+    return {
+        "total": values[0],
+        "counts": dict(zip(counts, values[1:1 + len(counts)])),
+        "distinct": dict(zip(distinct, values[1 + len(counts):])),
+    }
+
+
+def query_filtered(conn, table, filters, counts=None, before_id=None, page_size=50):
+    """Filtered page plus filtered KPI counts, all computed in SQL.
+
+    Args:
+        filters: filter spec (see build_where).
+        counts: optional {name: extra filter spec}; see kpi_counts.
+
+    Returns:
+        dict: {"page": DataFrame, "next_cursor": int | None, "total": int,
+               "counts": {name: int}}
+    """
+    page, next_cursor = fetch_filtered_page(conn, table, filters, before_id, page_size)
+    kpis = kpi_counts(conn, table, filters, counts)
+    return {
+        "page": page,
+        "next_cursor": next_cursor,
+        "total": kpis["total"],
+        "counts": kpis["counts"],
+    }
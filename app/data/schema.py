@@ -3,6 +3,8 @@ import pandas as pd
 import bcrypt
 from pathlib import Path
 from app.data.db import connect_database
+from app.data.migrations import run_migrations
+from app.data.triggers import resume_triggers
 
 def create_users_table(conn):
     """Create users table."""
@@ -26,7 +28,9 @@ def create_cyber_incidents_table(conn):
     create_table_sql=""" 
      CREATE TABLE IF NOT EXISTS cyber_incidents(
                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                   incident_id INTEGER,
                    date TEXT, 
+                   date_epoch INTEGER,
                    incident_type TEXT NOT NULL,
                    severity TEXT NOT NULL,             
                    status TEXT DEFAULT 'open',
@@ -76,7 +80,9 @@ def create_it_tickets_table(conn):
                    subject TEXT NOT NULL,
                    description TEXT,
                    created_date TEXT,
+                   created_epoch INTEGER,
                    resolved_date TEXT,
+                   resolved_epoch INTEGER,
                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                    );
     """
@@ -86,12 +92,87 @@ def create_it_tickets_table(conn):
     
 
 
+def create_ingestion_ledger_table(conn):
+    """Create ingestion ledger table (one fingerprint row per loaded source file)."""
+    cursor= conn.cursor()
+    create_table_sql="""
+        CREATE TABLE IF NOT EXISTS ingestion_ledger(
+                   source TEXT PRIMARY KEY,
+                   file_size INTEGER NOT NULL,
+                   mtime REAL NOT NULL,
+                   sha256 TEXT NOT NULL,
+                   byte_offset INTEGER NOT NULL,
+                   rows_ingested INTEGER DEFAULT 0,
+                   loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                   );
+    """
+    cursor.execute(create_table_sql)
+    conn.commit()
+    print("✅ Ingestion ledger table created successfully!")
+
+
+def create_sessions_table(conn):
+    """Create sessions table (one row per issued login token, see app/services/sessions.py)."""
+    cursor= conn.cursor()
+    create_table_sql="""
+        CREATE TABLE IF NOT EXISTS sessions(
+                   token_id TEXT PRIMARY KEY,
+                   username TEXT NOT NULL,
+                   created_at INTEGER NOT NULL,
+                   expires_at INTEGER NOT NULL,
+                   revoked INTEGER NOT NULL DEFAULT 0
+                   );
+    """
+    cursor.execute(create_table_sql)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expires_at ON sessions(expires_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_sessions_username ON sessions(username)")
+    conn.commit()
+    print("✅ Sessions table created successfully!")
+
+
+# Domain tables whose writes bump a version counter (used to invalidate caches/snapshots)
+VERSIONED_TABLES = ("cyber_incidents", "datasets_metadata", "it_tickets")
+
+
+def create_table_versions(conn):
+    """Create table_versions plus triggers that bump it on every write."""
+    cursor= conn.cursor()
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS table_versions(
+                   table_name TEXT PRIMARY KEY,
+                   version INTEGER NOT NULL DEFAULT 0
+                   );
+    """)
+    for table in VERSIONED_TABLES:
+        cursor.execute("INSERT OR IGNORE INTO table_versions (table_name, version) VALUES (?, 0)", (table,))
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE table_versions SET version = version + 1 WHERE table_name = '{table}';
+                END;
+            """)
+    conn.commit()
+    print("✅ Table versions created successfully!")
+
+
 def create_all_tables(conn):
     """Create all tables."""
     create_users_table(conn)
     create_cyber_incidents_table(conn)
     create_datasets_metadata_table(conn)
     create_it_tickets_table(conn)    
+    create_ingestion_ledger_table(conn)
+    create_sessions_table(conn)
+    create_table_versions(conn)
+    # Upgrades for older databases, plus indexes (see app/data/migrations.py)
+    run_migrations(conn)
+    # Put back triggers left dropped by a bulk load that was interrupted
+    resumed = resume_triggers(conn)
+    conn.commit()
+    if resumed:
+        print(f"⚠️  Restored triggers on {', '.join(resumed)} after an interrupted bulk load")
 
 
 
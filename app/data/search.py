@@ -0,0 +1,109 @@
+import re
+import sqlite3
+
+import pandas as pd
+
+# FTS5 index -> (base table, indexed text columns). The indexes are
+# "external content" tables: they store only the search index and read the
+# text back from the base table, and triggers keep them in sync.
+FTS_INDEXES = {
+    "incidents_fts": ("cyber_incidents", ("description",)),
+    "tickets_fts": ("it_tickets", ("subject", "description")),
+}
+
+
+def create_search_indexes(conn):
+    """Create the FTS5 indexes + sync triggers and index existing rows (does not commit).
+
+    Returns False (and changes nothing) if this SQLite build has no FTS5.
+    """
+    for fts, (table, columns) in FTS_INDEXES.items():
+        cols = ", ".join(columns)
+        new_vals = ", ".join(f"new.{c}" for c in columns)
+        old_vals = ", ".join(f"old.{c}" for c in columns)
+        try:
+            conn.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                    {cols}, content='{table}', content_rowid='id', tokenize='porter unicode61'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            print(f"⚠️  Full-text search disabled: {e}")
+            return False
+
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_insert AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_vals});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_delete AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{fts}_update AFTER UPDATE OF {cols} ON {table} BEGIN
+                INSERT INTO {fts} ({fts}, rowid, {cols}) VALUES ('delete', old.id, {old_vals});
+                INSERT INTO {fts} (rowid, {cols}) VALUES (new.id, {new_vals});
+            END
+        """)
+        conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+    return True
+
+
+def _has_index(conn, fts):
+    cur = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,))
+    return cur.fetchone() is not None
+
+
+def _fts_query(text):
+    """Turn free text into a safe FTS5 query: every word must match (as a prefix)."""
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{w}"*' for w in words)
+
+
+def _search(conn, fts, text, limit, offset):
+    table, columns = FTS_INDEXES[fts]
+    match = _fts_query(text)
+    if not match:
+        return pd.DataFrame()
+
+    if not _has_index(conn, fts):
+        # No FTS5 in this SQLite build: slow LIKE scan, same result shape
+        words = re.findall(r"\w+", text)
+        where = " AND ".join(
+            "(" + " OR ".join(f"{c} LIKE ?" for c in columns) + ")" for _ in words
+        )
+        params = [f"%{w}%" for w in words for _ in columns]
+        return pd.read_sql_query(
+            f"SELECT *, {columns[-1]} AS snippet, 0.0 AS rank FROM {table} "
+            f"WHERE {where} ORDER BY id DESC LIMIT ? OFFSET ?",
+            conn,
+            params=(*params, limit, offset)
+        )
+
+    query = f"""
+        SELECT t.*,
+               snippet({fts}, -1, '**', '**', '…', 12) AS snippet,
+               bm25({fts}) AS rank
+        FROM {fts}
+        JOIN {table} t ON t.id = {fts}.rowid
+        WHERE {fts} MATCH ?
+        ORDER BY rank
+        LIMIT ? OFFSET ?
+    """
+    return pd.read_sql_query(query, conn, params=(match, limit, offset))
+
+
+def search_incidents(conn, text, limit=20, offset=0):
+    """Full-text search over incident descriptions.
+
+    Returns one page of matches as a DataFrame, best match first, with a
+    'snippet' column (matches wrapped in ** **) and a bm25 'rank'.
+    """
+    return _search(conn, "incidents_fts", text, limit, offset)
+
+
+def search_tickets(conn, text, limit=20, offset=0):
+    """Full-text search over ticket subject + description (same result shape as search_incidents)."""
+    return _search(conn, "tickets_fts", text, limit, offset)
@@ -0,0 +1,116 @@
+import os
+from pathlib import Path
+
+import pandas as pd
+from app.data.db import get_table_version
+from app.data.dtypes import compact_frame
+
+# pyarrow is optional: without it we simply fall back to reading SQLite
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+except Exception:
+    pa = None
+
+SNAPSHOT_TABLES = ("cyber_incidents", "datasets_metadata", "it_tickets")
+
+# Rows per Arrow record batch when writing a snapshot
+BATCH_ROWS = 100_000
+
+# SQLite declared type -> Arrow type
+_ARROW_TYPES = {
+    "INTEGER": "int64",
+    "REAL": "float64",
+}
+
+
+def snapshots_available():
+    """True if pyarrow is installed and snapshots can be used."""
+    return pa is not None
+
+
+def _db_file(conn):
+    """Path of the main database file behind a connection ('' for :memory:)."""
+    return conn.execute("PRAGMA database_list").fetchone()[2]
+
+
+def snapshot_path(conn, table):
+    """Where the snapshot for a table lives: <db dir>/snapshots/<db name>.<table>.arrow"""
+    db_file = Path(_db_file(conn))
+    return db_file.parent / "snapshots" / f"{db_file.stem}.{table}.arrow"
+
+
+def _arrow_schema(conn, table):
+    fields = []
+    for _, name, decl, *_ in conn.execute(f"PRAGMA table_info({table})"):
+        fields.append(pa.field(name, getattr(pa, _ARROW_TYPES.get(decl.upper(), "string"))()))
+    return pa.schema(fields)
+
+
+def write_snapshot(conn, table):
+    """Write a columnar (Arrow IPC) snapshot of a table, tagged with its version.
+
+    Rows are streamed from SQLite in batches, so memory stays bounded. The file
+    is written next to the final path and renamed into place.
+
+    Returns:
+        Path | None: snapshot path, or None if snapshots are unavailable.
+    """
+    if pa is None or not _db_file(conn):
+        return None
+
+    version = get_table_version(conn, table)
+    path = snapshot_path(conn, table)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+
+    schema = _arrow_schema(conn, table).with_metadata({"table_version": str(version)})
+    chunks = pd.read_sql_query(f"SELECT * FROM {table} ORDER BY id DESC", conn, chunksize=BATCH_ROWS)
+    with pa.OSFile(str(tmp), "wb") as sink, ipc.new_file(sink, schema) as writer:
+        for chunk in chunks:
+            writer.write_batch(pa.RecordBatch.from_pandas(chunk, schema=schema, preserve_index=False))
+    os.replace(tmp, path)
+    return path
+
+
+def read_snapshot(conn, table):
+    """Memory-map a table's snapshot as a DataFrame.
+
+    Returns None if there is no snapshot or it is stale (the table has been
+    written to since the snapshot was taken).
+    """
+    if pa is None or not _db_file(conn):
+        return None
+    path = snapshot_path(conn, table)
+    if not path.exists():
+        return None
+
+    with pa.memory_map(str(path), "r") as source:
+        reader = ipc.open_file(source)
+        meta = reader.schema.metadata or {}
+        if int(meta.get(b"table_version", -1)) != get_table_version(conn, table):
+            return None
+        return reader.read_all().to_pandas()
+
+
+def load_table(conn, table, compact=False):
+    """Get a whole domain table as a DataFrame (newest first).
+
+    Uses the snapshot when it is fresh, otherwise reads SQLite and refreshes
+    the snapshot for next time. compact=True applies dtypes.compact_frame.
+    """
+    df = read_snapshot(conn, table)
+    if df is None and write_snapshot(conn, table) is not None:
+        df = read_snapshot(conn, table)
+    if df is None:
+        df = pd.read_sql_query(f"SELECT * FROM {table} ORDER BY id DESC", conn)
+    return compact_frame(df, table) if compact else df
+
+
+def write_all_snapshots(conn):
+    """Refresh snapshots for every domain table. Returns how many were written."""
+    written = 0
+    for table in SNAPSHOT_TABLES:
+        if write_snapshot(conn, table) is not None:
+            written += 1
+    return written
@@ -1,5 +1,11 @@
 import pandas as pd
-from app.data.db import connect_database
+from app.data.db import commit, connect_database
+from app.data.timestamps import normalise_series, to_epoch, to_iso
+from app.data.bulk import bulk_insert, to_frame
+from app.data.pagination import fetch_page, iter_batches
+from app.data.dtypes import compact_frame
+from app.data.cache import cached
+from app.data.query_builder import kpi_counts
 
 
 def insert_ticket(conn, ticket_id, priority, status, category, subject, description=None, created_date=None, resolved_date=None):
@@ -7,20 +13,58 @@ def insert_ticket(conn, ticket_id, priority, status, category, subject, descript
     cursor = conn.cursor()
     sql = """
         INSERT INTO it_tickets
-            (ticket_id, priority, status, category, subject, description, created_date, resolved_date)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            (ticket_id, priority, status, category, subject, description,
+             created_date, created_epoch, resolved_date, resolved_epoch)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
     """
-    cursor.execute(sql, (ticket_id, priority, status, category, subject, description, created_date, resolved_date))
-    conn.commit()
+    cursor.execute(sql, (ticket_id, priority, status, category, subject, description,
+                         to_iso(created_date), to_epoch(created_date),
+                         to_iso(resolved_date), to_epoch(resolved_date)))
+    commit(conn)
     return cursor.lastrowid
 
 
-def get_all_tickets(conn):
-    """Get all tickets as a DataFrame."""
-    return pd.read_sql_query(
+# Bulk input columns, in insert_ticket's argument order
+TICKET_COLUMNS = ("ticket_id", "priority", "status", "category", "subject", "description", "created_date", "resolved_date")
+
+
+def insert_tickets(conn, rows, on_conflict=None):
+    """Insert many tickets in one transaction and return their DB IDs.
+
+    rows: a DataFrame, or an iterable of dicts or tuples in TICKET_COLUMNS order.
+    on_conflict: None, "ignore", "replace" or "upsert" (matched on ticket_id).
+    """
+    df = to_frame(rows, TICKET_COLUMNS)
+    df["created_date"], df["created_epoch"] = normalise_series(df["created_date"])
+    df["resolved_date"], df["resolved_epoch"] = normalise_series(df["resolved_date"])
+    return bulk_insert(conn, "it_tickets", df, key="ticket_id", on_conflict=on_conflict)
+
+
+def get_all_tickets(conn, compact=False):
+    """Get all tickets as a DataFrame.
+
+    compact=True returns categorical/datetime64/downcast columns instead
+    (see dtypes.compact_frame; memory before/after is in df.attrs["memory"]).
+    """
+    df = pd.read_sql_query(
         "SELECT * FROM it_tickets ORDER BY id DESC",
         conn
     )
+    return compact_frame(df, "it_tickets") if compact else df
+
+
+def get_tickets_page(conn, before_id=None, page_size=100):
+    """One page of tickets, newest first, as (DataFrame, next cursor).
+
+    Pass the returned cursor as before_id to get the next page; it is None
+    after the last page.
+    """
+    return fetch_page(conn, "it_tickets", before_id, page_size)
+
+
+def iter_tickets(conn, batch_size=10_000):
+    """Stream all tickets as DataFrame batches (newest first) in constant memory."""
+    return iter_batches(conn, "it_tickets", batch_size)
 
 
 def get_ticket_by_id(conn, db_id):
@@ -44,11 +88,15 @@ def update_ticket(conn, db_id, ticket_id, priority, status, category, subject, d
             subject = ?,
             description = ?,
             created_date = ?,
-            resolved_date = ?
+            created_epoch = ?,
+            resolved_date = ?,
+            resolved_epoch = ?
         WHERE id = ?
     """
-    cursor.execute(sql, (ticket_id, priority, status, category, subject, description, created_date, resolved_date, db_id))
-    conn.commit()
+    cursor.execute(sql, (ticket_id, priority, status, category, subject, description,
+                         to_iso(created_date), to_epoch(created_date),
+                         to_iso(resolved_date), to_epoch(resolved_date), db_id))
+    commit(conn)
     return cursor.rowcount
 
 
@@ -57,7 +105,7 @@ def update_ticket_status(conn, db_id, new_status):
     cursor = conn.cursor()
     sql = "UPDATE it_tickets SET status = ? WHERE id = ?"
     cursor.execute(sql, (new_status, db_id))
-    conn.commit()
+    commit(conn)
     return cursor.rowcount
 
 
@@ -66,7 +114,7 @@ def update_ticket_priority(conn, db_id, new_priority):
     cursor = conn.cursor()
     sql = "UPDATE it_tickets SET priority = ? WHERE id = ?"
     cursor.execute(sql, (new_priority, db_id))
-    conn.commit()
+    commit(conn)
     return cursor.rowcount
 
 
@@ -75,16 +123,48 @@ def delete_ticket(conn, db_id):
     cursor = conn.cursor()
     sql = "DELETE FROM it_tickets WHERE id = ?"
     cursor.execute(sql, (db_id,))
-    conn.commit()
+    commit(conn)
     return cursor.rowcount
 
 
 
+@cached("it_tickets")
 def get_tickets_by_status_count(conn):
+    # Reads the trigger-maintained ticket_counts table (O(groups), not O(rows))
     query = """
-    SELECT status, COUNT(*) as count
-    FROM it_tickets
+    SELECT status, SUM(count) as count
+    FROM ticket_counts
     GROUP BY status
     ORDER BY count DESC
     """
-    return pd.read_sql_query(query, conn)
\ No newline at end of file
+    return pd.read_sql_query(query, conn)
+
+
+def get_ticket_kpis(conn, filters=None):
+    """All dashboard metric tiles for a filter spec, from one SQL pass.
+
+    filters: e.g. {"priority": ["High", "Critical"], "status": ["Open"]}
+    (see query_builder.build_where). Cached until it_tickets changes.
+
+    Returns:
+        dict: total, open, high_priority, unique_categories
+    """
+    kpis = kpi_counts(
+        conn, "it_tickets", filters,
+        counts={"open": {"status": ["Open"]}, "high_priority": {"priority": ["High"]}},
+        distinct=("category",),
+    )
+    return {"total": kpis["total"], **kpis["counts"], "unique_categories": kpis["distinct"]["category"]}
+
+
+def get_tickets_created_in_range(conn, start, end):
+    """Tickets created with start <= created_date < end, newest first (uses created_epoch index)."""
+    return pd.read_sql_query(
+        """
+        SELECT * FROM it_tickets
+        WHERE created_epoch >= ? AND created_epoch < ?
+        ORDER BY created_epoch DESC
+        """,
+        conn,
+        params=(to_epoch(start), to_epoch(end))
+    )
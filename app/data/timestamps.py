@@ -0,0 +1,36 @@
+import pandas as pd
+
+# Every stored timestamp uses this ISO-8601 form (naive values are treated as UTC)
+ISO_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_EPOCH = pd.Timestamp("1970-01-01")
+
+
+def to_iso(value):
+    """Normalise one timestamp to ISO_FORMAT in UTC. Unparseable values are returned unchanged."""
+    if value is None:
+        return None
+    ts = pd.to_datetime(value, errors="coerce", utc=True)
+    return value if pd.isna(ts) else ts.strftime(ISO_FORMAT)
+
+
+def to_epoch(value):
+    """Seconds since 1970-01-01 UTC for one timestamp, or None if it can't be parsed."""
+    if value is None:
+        return None
+    ts = pd.to_datetime(value, errors="coerce", utc=True)
+    return None if pd.isna(ts) else int(ts.timestamp())
+
+
+def normalise_series(values):
+    """Vectorised to_iso/to_epoch for a whole column.
+
+    Returns:
+        tuple: (iso Series, nullable Int64 epoch Series)
+    """
+    # utc=True: offsets are converted, naive values taken as UTC, and a column
+    # mixing the two parses instead of raising "Mixed timezones detected"
+    dt = pd.to_datetime(values, errors="coerce", format="mixed", utc=True).dt.tz_localize(None)
+    iso = dt.dt.strftime(ISO_FORMAT).where(dt.notna(), values)
+    epoch = ((dt - _EPOCH) // pd.Timedelta(seconds=1)).astype("Int64")
+    return iso, epoch
@@ -0,0 +1,107 @@
+# Bulk loads without per-row triggers.
+#
+# Every row written to a domain table fires four trigger families: the
+# table_versions bump (schema.py), the aggregate counts (aggregates.py), the
+# FTS sync (search.py) and the change_log feed (changes.py). For a big load
+# it is far cheaper to drop them, write the rows, and then catch up once:
+# rebuild the aggregates and the FTS index, bump the version once and log a
+# single 'R' (reload) change so readers refetch the whole table.
+#
+# The dropped trigger SQL is saved in suspended_triggers in the same
+# transaction as the DROP, so if a load dies half way resume_triggers (run
+# by create_all_tables on the next start) can still put everything back.
+
+from contextlib import contextmanager
+
+from app.data.aggregates import AGGREGATES, rebuild_aggregates
+from app.data.search import FTS_INDEXES, _has_index
+
+
+def create_suspended_triggers_table(conn):
+    """Create suspended_triggers (does not commit)."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS suspended_triggers(
+            name TEXT PRIMARY KEY,
+            table_name TEXT NOT NULL,
+            sql TEXT NOT NULL
+        )
+    """)
+
+
+def _trigger_prefixes(table):
+    """Name prefixes of the triggers the catch-up in resume_triggers replaces."""
+    prefixes = [f"trg_{table}_version_", f"trg_{table}_changes_"]
+    prefixes += [f"trg_{agg}_" for agg, (base, _) in AGGREGATES.items() if base == table]
+    prefixes += [f"trg_{fts}_" for fts, (base, _) in FTS_INDEXES.items() if base == table]
+    return prefixes
+
+
+def suspend_triggers(conn, table):
+    """Save and drop the per-row triggers on `table` (does not commit).
+
+    Returns:
+        int: number of triggers dropped.
+    """
+    triggers = [
+        (name, sql)
+        for name, sql in conn.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?", (table,)
+        )
+        if name.startswith(tuple(_trigger_prefixes(table)))
+    ]
+    # The INSERT opens the transaction, so the DROPs below commit with it
+    conn.executemany(
+        "INSERT OR REPLACE INTO suspended_triggers (name, table_name, sql) VALUES (?, ?, ?)",
+        [(name, table, sql) for name, sql in triggers]
+    )
+    for name, _ in triggers:
+        conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+    return len(triggers)
+
+
+def resume_triggers(conn, tables=None):
+    """Recreate suspended triggers and bring derived data up to date (does not commit).
+
+    For each table that had triggers suspended: aggregates and FTS indexes
+    are rebuilt, table_versions is bumped once and one 'R' change is logged.
+    With tables=None every suspended table is resumed.
+
+    Returns:
+        list: the tables that were resumed.
+    """
+    sql = "SELECT DISTINCT table_name FROM suspended_triggers"
+    suspended = [row[0] for row in conn.execute(sql)]
+    resumed = [t for t in suspended if tables is None or t in tables]
+
+    for table in resumed:
+        saved = conn.execute(
+            "SELECT name, sql FROM suspended_triggers WHERE table_name = ?", (table,)
+        ).fetchall()
+        # DELETE first: it opens the transaction the CREATEs then run in
+        conn.execute("DELETE FROM suspended_triggers WHERE table_name = ?", (table,))
+        for name, trigger_sql in saved:
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}")
+            conn.execute(trigger_sql)
+
+        rebuild_aggregates(conn, [agg for agg, (base, _) in AGGREGATES.items() if base == table])
+        for fts, (base, _) in FTS_INDEXES.items():
+            if base == table and _has_index(conn, fts):
+                conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+        conn.execute("UPDATE table_versions SET version = version + 1 WHERE table_name = ?", (table,))
+        conn.execute("INSERT INTO change_log (table_name, row_id, op) VALUES (?, 0, 'R')", (table,))
+    return resumed
+
+
+@contextmanager
+def triggers_suspended(conn, *tables):
+    """Run a bulk write on `tables` with their per-row triggers dropped.
+
+    The triggers come back (and the catch-up runs) when the block exits,
+    in the caller's transaction; the caller commits as usual.
+    """
+    for table in tables:
+        suspend_triggers(conn, table)
+    try:
+        yield
+    finally:
+        resume_triggers(conn, tables)
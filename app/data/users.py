@@ -24,3 +24,27 @@ def insert_user(username, password_hash, role="user"):
     finally:
         conn.close()
 
+
+def insert_user_if_new(conn, username, password_hash, role="user"):
+    """INSERT ... ON CONFLICT DO NOTHING on the caller's connection (does not commit).
+
+    Returns:
+        bool: True if the user was inserted, False if the username was taken.
+    """
+    cursor = conn.execute(
+        "INSERT INTO users (username, password_hash, role) VALUES (?, ?, ?) ON CONFLICT(username) DO NOTHING",
+        (username, password_hash, role)
+    )
+    return cursor.rowcount == 1
+
+
+def get_existing_usernames(conn, usernames):
+    """The subset of usernames that already exist (checked in batches of 500)."""
+    usernames = list(usernames)
+    found = set()
+    for i in range(0, len(usernames), 500):
+        batch = usernames[i:i + 500]
+        marks = ", ".join("?" for _ in batch)
+        found.update(r[0] for r in conn.execute(f"SELECT username FROM users WHERE username IN ({marks})", batch))
+    return found
+
@@ -0,0 +1,157 @@
+import argparse
+import os
+import statistics
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import bcrypt
+
+# bcrypt releases the GIL while hashing, so threads run hashes in parallel.
+# Workers bound CPU use; MAX_QUEUE_DEPTH bounds how many requests may wait.
+HASH_WORKERS = min(4, os.cpu_count() or 1)
+MAX_QUEUE_DEPTH = 32
+REQUEST_TIMEOUT_S = 10
+# Bulk hashing (hash_passwords) gets its own, smaller pool so a big batch
+# never sits in front of interactive logins/registrations
+BATCH_WORKERS = max(1, HASH_WORKERS // 2)
+
+# Work factor for new hashes (existing hashes keep the cost they were made with)
+BCRYPT_ROUNDS = 12
+
+_pool = ThreadPoolExecutor(max_workers=HASH_WORKERS, thread_name_prefix="bcrypt")
+_batch_pool = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="bcrypt-batch")
+_slots = threading.BoundedSemaphore(HASH_WORKERS + MAX_QUEUE_DEPTH)
+_lock = threading.Lock()
+_samples = deque(maxlen=1000)     # (operation, wait_ms, run_ms) for recent requests
+_counts = {"hash": 0, "verify": 0, "rejected": 0, "timeouts": 0}
+
+
+class AuthBusyError(Exception):
+    """Raised when the hashing queue is full or a request timed out."""
+
+
+def _run(operation, fn, *args):
+    if not _slots.acquire(blocking=False):
+        with _lock:
+            _counts["rejected"] += 1
+        raise AuthBusyError("Too many login/registration requests in progress.")
+
+    submitted = time.perf_counter()
+
+    def job():
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            done = time.perf_counter()
+            with _lock:
+                _counts[operation] += 1
+                _samples.append((operation, (started - submitted) * 1000, (done - started) * 1000))
+            _slots.release()
+
+    future = _pool.submit(job)
+    try:
+        return future.result(timeout=REQUEST_TIMEOUT_S)
+    except FutureTimeout:
+        # Still queued: drop it (job() never runs, so give its slot back here)
+        if future.cancel():
+            _slots.release()
+        with _lock:
+            _counts["timeouts"] += 1
+        raise AuthBusyError("Password check timed out.")
+
+
+def hash_password(password, rounds=None):
+    """bcrypt-hash a password on the worker pool. Returns the hash as text."""
+    salt = bcrypt.gensalt(rounds or BCRYPT_ROUNDS)
+    return _run("hash", bcrypt.hashpw, password.encode("utf-8"), salt).decode("utf-8")
+
+
+def hash_passwords(passwords, rounds=None):
+    """Hash many passwords in parallel (bulk provisioning). Returns hashes in input order.
+
+    Runs on its own BATCH_WORKERS pool, not the interactive one, so logins
+    and registrations keep their workers and queue slots while a batch runs.
+    """
+    salt_rounds = rounds or BCRYPT_ROUNDS
+
+    def job(password):
+        started = time.perf_counter()
+        hashed = bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(salt_rounds))
+        with _lock:
+            _counts["hash"] += 1
+            _samples.append(("hash", 0.0, (time.perf_counter() - started) * 1000))
+        return hashed.decode("utf-8")
+
+    return list(_batch_pool.map(job, passwords))
+
+
+def verify_password(password, password_hash):
+    """Check a password against a stored bcrypt hash on the worker pool."""
+    if isinstance(password_hash, str):
+        password_hash = password_hash.encode("utf-8")
+    return _run("verify", bcrypt.checkpw, password.encode("utf-8"), password_hash)
+
+
+def _percentile(values, pct):
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return round(values[0], 2)
+    return round(statistics.quantiles(values, n=100)[pct - 1], 2)
+
+
+def auth_stats():
+    """Request counts plus p50/p95 queue wait and bcrypt run time (ms) over recent requests."""
+    with _lock:
+        samples = list(_samples)
+        counts = dict(_counts)
+    waits = [s[1] for s in samples]
+    runs = [s[2] for s in samples]
+    return {
+        **counts,
+        "workers": HASH_WORKERS,
+        "batch_workers": BATCH_WORKERS,
+        "max_queue_depth": MAX_QUEUE_DEPTH,
+        "rounds": BCRYPT_ROUNDS,
+        "wait_p50_ms": _percentile(waits, 50),
+        "wait_p95_ms": _percentile(waits, 95),
+        "run_p50_ms": _percentile(runs, 50),
+        "run_p95_ms": _percentile(runs, 95),
+    }
+
+
+def calibrate_cost(target_ms=250, min_rounds=10, max_rounds=16, apply=True):
+    """Pick the highest bcrypt cost whose hash time on this host is <= target_ms.
+
+    Each extra round doubles the work, so rounds are timed from min_rounds up
+    until the target is passed. With apply=True the result becomes BCRYPT_ROUNDS.
+
+    Returns:
+        tuple: (rounds, {rounds: measured ms})
+    """
+    global BCRYPT_ROUNDS
+    timings = {}
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        t0 = time.perf_counter()
+        bcrypt.hashpw(b"calibration-password", bcrypt.gensalt(rounds))
+        timings[rounds] = round((time.perf_counter() - t0) * 1000, 1)
+        if timings[rounds] > target_ms:
+            break
+        chosen = rounds
+
+    if apply:
+        BCRYPT_ROUNDS = chosen
+    print(f"✅ bcrypt cost {chosen} (target {target_ms} ms, measured {timings})")
+    return chosen, timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure bcrypt cost factors on this host.")
+    parser.add_argument("--target-ms", type=float, default=250)
+    args = parser.parse_args()
+    calibrate_cost(args.target_ms, apply=False)
@@ -0,0 +1,213 @@
+import argparse
+import json
+import platform
+import sqlite3
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+from app.data import datasets, incidents, tickets
+from app.data.cache import clear_cache
+from app.data.db import close_all_connections, connect_database
+from app.data.dtypes import compact_frame
+from app.data.loader import DEFAULT_CHUNKSIZE, load_all_csv_data
+from app.data.query_builder import grouped_counts, query_filtered
+from app.data.schema import create_all_tables
+from app.data.snapshots import load_table
+from app.services.synthetic_data import generate_dataset
+
+DEFAULT_SCALES = [1_000, 10_000, 100_000]
+
+
+def _elapsed_ms(fn):
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) * 1000
+
+
+def _time_call(fn, repeats):
+    """Run fn `repeats` times and return timings in milliseconds.
+
+    Each repeat starts with an empty query cache (min/median/max are cold
+    timings, i.e. real SQLite work) and is followed by one more call that is
+    served from the cache (warm_median_ms).
+    """
+    cold, warm = [], []
+    for _ in range(repeats):
+        clear_cache()
+        cold.append(_elapsed_ms(fn))
+        warm.append(_elapsed_ms(fn))
+    return {
+        "min_ms": round(min(cold), 3),
+        "median_ms": round(statistics.median(cold), 3),
+        "max_ms": round(max(cold), 3),
+        "warm_median_ms": round(statistics.median(warm), 3),
+    }
+
+
+INCIDENT_FILTERS = {
+    "severity": ["High", "Critical"],
+    "status": ["Open", "In Progress"],
+    "incident_type": ["Phishing", "Malware"],
+}
+TICKET_FILTERS = {"priority": ["High", "Critical"], "status": ["Open"]}
+
+
+def _dashboard_filter_path(conn):
+    """What one dashboard rerun does for the incident + ticket tabs (SQL pushdown)."""
+    inc = query_filtered(
+        conn, "cyber_incidents", INCIDENT_FILTERS,
+        counts={"open": {"status": ["Open"]}, "high": {"severity": ["High"]}}, page_size=200,
+    )
+    _ = (inc["total"], len(grouped_counts(conn, "cyber_incidents", INCIDENT_FILTERS, "incident_type")))
+
+    tk = query_filtered(
+        conn, "it_tickets", TICKET_FILTERS,
+        counts={"open": {"status": ["Open"]}, "high": {"priority": ["High"]}}, page_size=200,
+    )
+    _ = (tk["total"], grouped_counts(conn, "it_tickets", TICKET_FILTERS, "category"),
+         grouped_counts(conn, "it_tickets", TICKET_FILTERS, "priority"))
+
+
+def _dashboard_filter_path_pandas(conn):
+    """The old dashboard path: load whole tables, then filter in pandas. Kept for comparison."""
+    inc = load_table(conn, "cyber_incidents")
+    filt = inc[
+        inc["severity"].isin(INCIDENT_FILTERS["severity"])
+        & inc["status"].isin(INCIDENT_FILTERS["status"])
+        & inc["incident_type"].isin(INCIDENT_FILTERS["incident_type"])
+    ]
+    _ = (len(filt), (filt["status"] == "Open").sum(), (filt["severity"] == "High").sum(),
+         filt["incident_type"].nunique())
+
+    tk = load_table(conn, "it_tickets")
+    tf = tk[tk["priority"].isin(TICKET_FILTERS["priority"]) & tk["status"].isin(TICKET_FILTERS["status"])]
+    _ = (len(tf), (tf["status"] == "Open").sum(), (tf["priority"] == "High").sum(),
+         tf["category"].nunique(), tf.groupby("priority").size())
+
+
+def _query_suite(conn):
+    """(name, callable) for every read query in incidents/tickets/datasets + the dashboard path."""
+    return [
+        ("incidents.get_all_incidents", lambda: incidents.get_all_incidents(conn)),
+        ("incidents.get_all_incidents(compact)", lambda: incidents.get_all_incidents(conn, compact=True)),
+        ("incidents.get_incidents_page", lambda: incidents.get_incidents_page(conn, page_size=100)),
+        ("incidents.iter_incidents", lambda: sum(len(b) for b in incidents.iter_incidents(conn))),
+        ("incidents.get_incidents_by_type_count", lambda: incidents.get_incidents_by_type_count(conn)),
+        ("incidents.get_high_severity_by_status", lambda: incidents.get_high_severity_by_status(conn)),
+        ("incidents.get_incident_kpis", lambda: incidents.get_incident_kpis(conn, INCIDENT_FILTERS)),
+        ("incidents.get_incident_types_with_many_cases",
+         lambda: incidents.get_incident_types_with_many_cases(conn, min_count=5)),
+        ("tickets.get_all_tickets", lambda: tickets.get_all_tickets(conn)),
+        ("tickets.get_all_tickets(compact)", lambda: tickets.get_all_tickets(conn, compact=True)),
+        ("tickets.get_tickets_page", lambda: tickets.get_tickets_page(conn, page_size=100)),
+        ("tickets.iter_tickets", lambda: sum(len(b) for b in tickets.iter_tickets(conn))),
+        ("tickets.get_ticket_by_id", lambda: tickets.get_ticket_by_id(conn, 1)),
+        ("tickets.get_tickets_by_status_count", lambda: tickets.get_tickets_by_status_count(conn)),
+        ("tickets.get_ticket_kpis", lambda: tickets.get_ticket_kpis(conn, TICKET_FILTERS)),
+        ("datasets.get_all_datasets", lambda: datasets.get_all_datasets(conn)),
+        ("datasets.get_datasets_page", lambda: datasets.get_datasets_page(conn, page_size=100)),
+        ("datasets.iter_datasets", lambda: sum(len(b) for b in datasets.iter_datasets(conn))),
+        ("datasets.get_dataset_by_id", lambda: datasets.get_dataset_by_id(conn, 1)),
+        ("datasets.get_dataset_by_name", lambda: datasets.get_dataset_by_name(conn, "Dataset_00000001")),
+        ("datasets.get_datasets_by_category_count", lambda: datasets.get_datasets_by_category_count(conn)),
+        ("datasets.get_top_datasets_by_record_count",
+         lambda: datasets.get_top_datasets_by_record_count(conn, limit=10)),
+        ("dashboard.filter_path", lambda: _dashboard_filter_path(conn)),
+        ("dashboard.filter_path_pandas", lambda: _dashboard_filter_path_pandas(conn)),
+    ]
+
+
+def run_scale(rows, repeats=5, seed=42):
+    """Generate `rows` rows per domain into a temp DB and time load + queries."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        generate_dataset(tmp / "csv", rows, seed=seed)
+
+        conn = connect_database(tmp / "bench.db")
+        try:
+            create_all_tables(conn)
+            t0 = time.perf_counter()
+            load_all_csv_data(conn, chunksize=DEFAULT_CHUNKSIZE, data_dir=tmp / "csv")
+            load_s = time.perf_counter() - t0
+
+            results = {"rows": rows, "load_all_csv_data_s": round(load_s, 3), "queries": {}}
+            for name, fn in _query_suite(conn):
+                results["queries"][name] = _time_call(fn, repeats)
+                timing = results["queries"][name]
+                print(f"   {name:<50} {timing['median_ms']:>10.2f} ms cold {timing['warm_median_ms']:>10.2f} ms warm")
+
+            results["memory"] = {}
+            for table in ("cyber_incidents", "it_tickets", "datasets_metadata"):
+                df = compact_frame(pd.read_sql_query(f"SELECT * FROM {table}", conn), table, report=True)
+                results["memory"][table] = df.attrs["memory"]
+        finally:
+            conn.close()
+            close_all_connections()
+
+    return results
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except Exception:
+        return None
+
+
+def run_benchmark(scales=DEFAULT_SCALES, repeats=5, seed=42, out_path="bench_report.json"):
+    """Run every scale and write a JSON report. Returns the report dict."""
+    report = {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "seed": seed,
+        "repeats": repeats,
+        "scales": {},
+    }
+    for rows in scales:
+        print(f"\n📏 Scale: {rows:,} rows per domain")
+        report["scales"][str(rows)] = run_scale(rows, repeats=repeats, seed=seed)
+
+    Path(out_path).write_text(json.dumps(report, indent=2))
+    print(f"\n✅ Benchmark report written to {out_path}")
+    return report
+
+
+def compare_reports(old_path, new_path):
+    """Print median-time ratios (new / old) for every query both reports share."""
+    old = json.loads(Path(old_path).read_text())
+    new = json.loads(Path(new_path).read_text())
+    print(f"Comparing {old.get('commit')} -> {new.get('commit')} (ratio < 1 is faster)")
+    for scale, new_res in new["scales"].items():
+        old_res = old["scales"].get(scale)
+        if old_res is None:
+            continue
+        print(f"\n{int(scale):,} rows")
+        rows = [("load_all_csv_data", old_res["load_all_csv_data_s"], new_res["load_all_csv_data_s"])]
+        for name, timing in new_res["queries"].items():
+            if name in old_res["queries"]:
+                rows.append((name, old_res["queries"][name]["median_ms"], timing["median_ms"]))
+        for name, before, after in rows:
+            ratio = after / before if before else float("inf")
+            print(f"   {name:<50} {before:>10.2f} {after:>10.2f}  x{ratio:.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the data layer at several scales.")
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--out", default="bench_report.json")
+    parser.add_argument("--compare", help="older report to compare the new one against")
+    args = parser.parse_args()
+
+    run_benchmark(args.scales, repeats=args.repeats, seed=args.seed, out_path=args.out)
+    if args.compare:
+        compare_reports(args.compare, args.out)
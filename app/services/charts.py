@@ -0,0 +1,66 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Default point budgets: what a chart may send to the browser
+LINE_POINT_BUDGET = 2_000
+BAR_CATEGORY_BUDGET = 20
+
+
+@lru_cache(maxsize=None)
+def plotly_express():
+    """plotly.express, imported on first use and remembered (None if not installed)."""
+    try:
+        import plotly.express as px
+    except ImportError:
+        return None
+    return px
+
+
+def _numeric(values):
+    """x values as floats (datetimes become their integer epoch ticks)."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.astype("int64").to_numpy(dtype=float)
+    return pd.to_numeric(values, errors="coerce").to_numpy(dtype=float)
+
+
+def lttb(df, x, y, max_points=LINE_POINT_BUDGET):
+    """Downsample a line series to max_points with Largest-Triangle-Three-Buckets.
+
+    Keeps the first and last points and, from each bucket in between, the
+    point that forms the largest triangle with its neighbours - peaks and
+    dips survive, flat stretches are thinned.
+    """
+    n = len(df)
+    if n <= max_points or max_points < 3:
+        return df
+    if not df[x].is_monotonic_increasing:
+        df = df.sort_values(x)
+
+    xs = _numeric(df[x])
+    ys = np.nan_to_num(pd.to_numeric(df[y], errors="coerce").to_numpy(dtype=float))
+    # max_points - 2 buckets over the points between the first and the last
+    edges = np.linspace(1, n - 1, max_points - 1).astype(int)
+
+    keep = [0]
+    a = 0
+    for i in range(max_points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        cx, cy = xs[next_lo:next_hi].mean(), ys[next_lo:next_hi].mean()
+        area = np.abs((xs[a] - cx) * (ys[lo:hi] - ys[a]) - (xs[a] - xs[lo:hi]) * (cy - ys[a]))
+        a = lo + int(np.argmax(np.nan_to_num(area)))
+        keep.append(a)
+    keep.append(n - 1)
+    return df.iloc[keep]
+
+
+def top_n_with_other(df, x, y, max_bars=BAR_CATEGORY_BUDGET, other_label="Other"):
+    """Keep the max_bars - 1 largest bars and sum the rest into one "Other" bar."""
+    if len(df) <= max_bars or max_bars < 2:
+        return df
+    ranked = df.sort_values(y, ascending=False)
+    head, tail = ranked.iloc[:max_bars - 1], ranked.iloc[max_bars - 1:]
+    other = pd.DataFrame({x: [other_label], y: [tail[y].sum()]})
+    return pd.concat([head[[x, y]], other], ignore_index=True)
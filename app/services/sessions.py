@@ -0,0 +1,197 @@
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from app.data.db import DB_PATH, commit, connect_database
+from app.services.user_services import login_user
+
+# Login tokens look like "<token_id>.<expires_at>.<signature>". The HMAC
+# signature lets forged or expired tokens be rejected without touching the
+# database; the sessions table is the record of who owns a token and whether
+# it was revoked. bcrypt only runs once, in login_with_session.
+
+SESSION_TTL_S = 8 * 60 * 60
+CACHE_SIZE = 10_000
+# How long a validated token is trusted from memory before the sessions table
+# is checked again (so revocations from another process are seen)
+CACHE_TTL_S = 30
+SWEEP_BATCH = 1_000
+
+SECRET_FILE = DB_PATH.parent / ".session_secret"
+
+_lock = threading.Lock()
+_cache = OrderedDict()   # token_id -> (username, checked_at)
+_stats = {"hits": 0, "misses": 0, "rejected": 0}
+
+
+@lru_cache(maxsize=None)
+def _secret():
+    """Signing key: $SESSION_SECRET, else a random key kept next to the database."""
+    env = os.environ.get("SESSION_SECRET")
+    if env:
+        return env.encode("utf-8")
+    if not SECRET_FILE.exists():
+        SECRET_FILE.parent.mkdir(parents=True, exist_ok=True)
+        SECRET_FILE.write_bytes(secrets.token_bytes(32))
+        SECRET_FILE.chmod(0o600)
+    return SECRET_FILE.read_bytes()
+
+
+def _sign(payload):
+    return hmac.new(_secret(), payload.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+def _parse(token):
+    """(token_id, expires_at) for a correctly signed token, else None."""
+    try:
+        token_id, expires_at, signature = token.split(".")
+        expires_at = int(expires_at)
+    except (AttributeError, ValueError):
+        return None
+    if not hmac.compare_digest(signature, _sign(f"{token_id}.{expires_at}")):
+        return None
+    return token_id, expires_at
+
+
+def _forget(token_ids):
+    with _lock:
+        for token_id in token_ids:
+            _cache.pop(token_id, None)
+
+
+def _remember(token_id, username, now):
+    with _lock:
+        _cache[token_id] = (username, now)
+        _cache.move_to_end(token_id)
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def create_session(conn, username, ttl_s=SESSION_TTL_S):
+    """Issue a signed token for an already-authenticated user."""
+    now = int(time.time())
+    token_id = secrets.token_urlsafe(16)
+    expires_at = now + ttl_s
+    conn.execute(
+        "INSERT INTO sessions (token_id, username, created_at, expires_at) VALUES (?, ?, ?, ?)",
+        (token_id, username, now, expires_at)
+    )
+    commit(conn)
+    _remember(token_id, username, now)
+    return f"{token_id}.{expires_at}.{_sign(f'{token_id}.{expires_at}')}"
+
+
+def login_with_session(username, password, ttl_s=SESSION_TTL_S):
+    """Check the password once (bcrypt) and exchange it for a session token.
+
+    Returns:
+        tuple: (True, token) or (False, error message)
+    """
+    success, msg = login_user(username, password)
+    if not success:
+        return False, msg
+    conn = connect_database()
+    try:
+        return True, create_session(conn, username, ttl_s)
+    finally:
+        conn.close()
+
+
+def validate_session(conn, token):
+    """Username the token belongs to, or None if it is forged, expired or revoked.
+
+    Normally a signature check plus a dictionary lookup; the sessions table is
+    only read on a cache miss or once the cached entry is CACHE_TTL_S old.
+    """
+    parsed = _parse(token)
+    now = int(time.time())
+    if parsed is None or parsed[1] <= now:
+        with _lock:
+            _stats["rejected"] += 1
+        if parsed is not None:
+            _forget([parsed[0]])
+        return None
+
+    token_id = parsed[0]
+    with _lock:
+        entry = _cache.get(token_id)
+        fresh = entry is not None and now - entry[1] < CACHE_TTL_S
+        _stats["hits" if fresh else "misses"] += 1
+    if fresh:
+        return entry[0]
+
+    row = conn.execute(
+        "SELECT username FROM sessions WHERE token_id = ? AND revoked = 0 AND expires_at > ?",
+        (token_id, now)
+    ).fetchone()
+    if row is None:
+        _forget([token_id])
+        with _lock:
+            _stats["rejected"] += 1
+        return None
+    _remember(token_id, row[0], now)
+    return row[0]
+
+
+def revoke_sessions(conn, tokens):
+    """Revoke many tokens with one executemany and one commit. Returns rows revoked."""
+    token_ids = [t.split(".")[0] for t in tokens if t]
+    if not token_ids:
+        return 0
+    _forget(token_ids)
+    cursor = conn.executemany(
+        "UPDATE sessions SET revoked = 1 WHERE token_id = ? AND revoked = 0",
+        [(token_id,) for token_id in token_ids]
+    )
+    commit(conn)
+    return cursor.rowcount
+
+
+def revoke_user_sessions(conn, username):
+    """Log a user out everywhere. Returns rows revoked."""
+    cursor = conn.execute(
+        "UPDATE sessions SET revoked = 1 WHERE username = ? AND revoked = 0", (username,)
+    )
+    commit(conn)
+    with _lock:
+        for token_id in [k for k, (user, _) in _cache.items() if user == username]:
+            del _cache[token_id]
+    return cursor.rowcount
+
+
+def sweep_expired_sessions(conn, batch_size=SWEEP_BATCH):
+    """Delete expired and revoked sessions, batch_size rows per transaction.
+
+    Small batches keep each write lock short. Returns rows deleted.
+    """
+    now = int(time.time())
+    deleted = 0
+    while True:
+        cursor = conn.execute(
+            """
+            DELETE FROM sessions WHERE token_id IN (
+                SELECT token_id FROM sessions WHERE expires_at <= ? OR revoked = 1 LIMIT ?
+            )
+            """,
+            (now, batch_size)
+        )
+        commit(conn)
+        deleted += cursor.rowcount
+        if cursor.rowcount < batch_size:
+            break
+
+    with _lock:
+        for token_id in [k for k, (_, checked_at) in _cache.items() if now - checked_at >= CACHE_TTL_S]:
+            del _cache[token_id]
+    return deleted
+
+
+def session_stats():
+    """Validation cache hits/misses/rejections and cached token count."""
+    with _lock:
+        return {**_stats, "cached": len(_cache)}
@@ -1,7 +1,10 @@
 from app.data.db import connect_database
 from app.data.schema import create_all_tables
 from app.services.user_services import migrate_users_from_file
-from app.data.loader import load_all_csv_data
+from app.data.pipeline import run_ingestion_pipeline
+from app.data.snapshots import write_all_snapshots
+from app.data.changes import prune_change_log
+from app.services.sessions import sweep_expired_sessions
 
 def setup_database_complete():
     """
@@ -31,7 +34,21 @@ def setup_database_complete():
     
     # Step 4: Load CSV data
     print("\n[4/5] Loading CSV data...")
-    total_rows = load_all_csv_data(conn)
+    # (one parse process per CSV, single SQLite writer; see app.data.pipeline)
+    load_stats = run_ingestion_pipeline(conn)
+    total_rows = sum(s["rows"] for s in load_stats.values())
+
+    # Columnar snapshots make the next cold start of the dashboard fast
+    snapshot_count = write_all_snapshots(conn)
+    if snapshot_count:
+        print(f"       Wrote {snapshot_count} table snapshots")
+    # A bulk load logs one change per row; readers reload in full after it anyway
+    pruned = prune_change_log(conn)
+    if pruned:
+        print(f"       Pruned {pruned} change-log entries")
+    swept = sweep_expired_sessions(conn)
+    if swept:
+        print(f"       Removed {swept} expired/revoked sessions")
     
     # Step 5: Verify
     print("\n[5/5] Verifying database setup...")
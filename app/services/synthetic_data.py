@@ -0,0 +1,112 @@
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Value pools taken from the real DATA/ exports
+SEVERITIES = ["Low", "Medium", "High", "Critical"]
+INCIDENT_CATEGORIES = ["Phishing", "Malware", "DDoS", "Misconfiguration", "Unauthorized Access"]
+INCIDENT_STATUSES = ["Open", "In Progress", "Resolved", "Closed"]
+TICKET_PRIORITIES = ["Low", "Medium", "High", "Critical"]
+TICKET_STATUSES = ["Open", "In Progress", "Resolved", "Waiting for User"]
+ASSIGNEES = ["IT_Support_A", "IT_Support_B", "IT_Support_C"]
+UPLOADERS = ["data_scientist", "cyber_admin", "it_admin"]
+
+# Rows generated and written per chunk, so 10^7 rows never sit in memory at once
+CHUNK_ROWS = 1_000_000
+
+START = np.datetime64("2024-01-01T00:00:00")
+HOURS_IN_YEAR = 366 * 24
+
+
+def _rng(seed, domain, chunk_index):
+    """One independent generator per (domain, chunk index).
+
+    Chunks can be built independently, but the data depends on chunk_rows:
+    the same seed and rows only give the same files with the same chunk_rows.
+    """
+    return np.random.default_rng([seed, domain, chunk_index])
+
+
+def _timestamps(rng, n):
+    return START + rng.integers(0, HOURS_IN_YEAR, n).astype("timedelta64[h]")
+
+
+def _incidents_chunk(rng, first, n):
+    ids = np.arange(first, first + n)
+    return pd.DataFrame({
+        "incident_id": 1000 + ids,
+        "timestamp": pd.Series(_timestamps(rng, n)).dt.strftime("%Y-%m-%d %H:%M:%S.%f"),
+        "severity": rng.choice(SEVERITIES, n, p=[0.3, 0.35, 0.25, 0.1]),
+        "category": rng.choice(INCIDENT_CATEGORIES, n, p=[0.45, 0.2, 0.15, 0.1, 0.1]),
+        "status": rng.choice(INCIDENT_STATUSES, n),
+        "description": [f"Incident {i} description" for i in ids],
+    })
+
+
+def _tickets_chunk(rng, first, n):
+    ids = np.arange(first, first + n)
+    return pd.DataFrame({
+        "ticket_id": 2000 + ids,
+        "priority": rng.choice(TICKET_PRIORITIES, n, p=[0.3, 0.35, 0.25, 0.1]),
+        "description": [f"Ticket {i} problem description" for i in ids],
+        "status": rng.choice(TICKET_STATUSES, n),
+        "assigned_to": rng.choice(ASSIGNEES, n),
+        "created_at": pd.Series(_timestamps(rng, n)).dt.strftime("%Y-%m-%d %H:%M:%S"),
+        "resolution_time_hours": rng.integers(1, 72, n),
+    })
+
+
+def _datasets_chunk(rng, first, n):
+    ids = np.arange(first, first + n)
+    days = rng.integers(0, 366, n).astype("timedelta64[D]")
+    return pd.DataFrame({
+        "dataset_id": 1 + ids,
+        "name": [f"Dataset_{i:08d}" for i in ids],
+        "rows": rng.integers(1_000, 1_000_000, n),
+        "columns": rng.integers(5, 40, n),
+        "uploaded_by": rng.choice(UPLOADERS, n),
+        "upload_date": pd.Series(START.astype("datetime64[D]") + days).dt.strftime("%Y-%m-%d"),
+    })
+
+
+# (domain number used in the seed, CSV file name, chunk builder)
+DOMAINS = [
+    (0, "cyber_incidents.csv", _incidents_chunk),
+    (1, "it_tickets.csv", _tickets_chunk),
+    (2, "datasets_metadata.csv", _datasets_chunk),
+]
+
+
+def generate_dataset(out_dir, rows, seed=42, chunk_rows=CHUNK_ROWS):
+    """Write schema-faithful cyber_incidents / it_tickets / datasets_metadata CSVs.
+
+    Same seed + same rows + same chunk_rows -> byte-identical files.
+
+    Returns:
+        dict: {csv file name: Path}
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = {}
+
+    for domain, csv_name, build in DOMAINS:
+        path = out_dir / csv_name
+        for chunk_index, first in enumerate(range(0, rows, chunk_rows)):
+            n = min(chunk_rows, rows - first)
+            df = build(_rng(seed, domain, chunk_index), first, n)
+            df.to_csv(path, mode="w" if first == 0 else "a", header=first == 0, index=False)
+        written[csv_name] = path
+        print(f"✅ Generated {rows:,} rows -> {path}")
+
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic platform CSVs.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    generate_dataset(args.out_dir, args.rows, seed=args.seed)
@@ -1,41 +1,83 @@
-import bcrypt
-import sqlite3
+import time
 from pathlib import Path 
+from app.data.ledger import plan_ingestion, record_ingestion
 from app.data.db import connect_database
-from app.data.users import get_user_by_username, insert_user
+from app.data.users import get_existing_usernames, get_user_by_username, insert_user_if_new
 from app.data.schema import create_users_table
+from app.services.auth_service import AuthBusyError, hash_password, hash_passwords, verify_password
 
 
-def register_user(username, password, role='user'):
-    """Register new user with password hashing."""
-    conn = connect_database()
+_users_table_ready = False
 
-    # Ensure table exists (safe to call multiple times)
-    try:
+
+def _ensure_users_table(conn):
+    # DDL once per process, not once per registration
+    global _users_table_ready
+    if not _users_table_ready:
         create_users_table(conn)
-    except Exception:
-        # If your schema setup is handled elsewhere, don't block registration
-        pass
+        _users_table_ready = True
 
-    cursor = conn.cursor()
 
-    # Check if user already exists
-    cursor.execute("SELECT 1 FROM users WHERE username = ?", (username,))
-    if cursor.fetchone():
+def register_user(username, password, role='user'):
+    """Register new user with password hashing (one connection, one INSERT)."""
+    # Hash the password (on the bounded bcrypt pool, see auth_service.py)
+    try:
+        password_hash = hash_password(password)
+    except AuthBusyError as e:
+        return False, f"{e} Please try again."
+
+    conn = connect_database()
+    try:
+        _ensure_users_table(conn)
+        created = insert_user_if_new(conn, username, password_hash, role)
+        conn.commit()
+    finally:
         conn.close()
+
+    if not created:
         return False, f"Username '{username}' already exists."
+    return True, f"User '{username}' registered successfully!"
 
-    # Hash the password
-    password_bytes = password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    password_hash = hashed.decode('utf-8')
 
-    # Insert via data-layer helper
-    insert_user(username, password_hash, role)
+def register_users(users, role='user'):
+    """Register many users: passwords hashed in parallel, one insert transaction.
 
-    conn.close()
-    return True, f"User '{username}' registered successfully!"
+    users: iterable of (username, password) or (username, password, role).
+    Usernames that already exist (or repeat in the batch) are not hashed.
+
+    Returns:
+        list: (username, success, message) per input entry, like register_user.
+    """
+    entries = [(u[0], u[1], u[2] if len(u) > 2 else role) for u in users]
+    conn = connect_database()
+    try:
+        _ensure_users_table(conn)
+        existing = get_existing_usernames(conn, {e[0] for e in entries})
+
+        todo, seen = [], set()
+        for username, password, user_role in entries:
+            if username not in existing and username not in seen:
+                seen.add(username)
+                todo.append((username, password, user_role))
+        hashes = hash_passwords([password for _, password, _ in todo])
+
+        created = set()
+        with conn:
+            for (username, _, user_role), password_hash in zip(todo, hashes):
+                if insert_user_if_new(conn, username, password_hash, user_role):
+                    created.add(username)
+    finally:
+        conn.close()
+
+    results, reported = [], set()
+    for username, _, _ in entries:
+        if username in created and username not in reported:
+            reported.add(username)
+            results.append((username, True, f"User '{username}' registered successfully!"))
+        else:
+            results.append((username, False, f"Username '{username}' already exists."))
+    print(f"✅ Registered {len(created)} of {len(entries)} users")
+    return results
 
 
 def login_user(username, password):
@@ -53,10 +95,12 @@ def login_user(username, password):
     
     # Verify password (user[2] is password_hash column)
     stored_hash = user[2]
-    password_bytes = password.encode('utf-8')
-    hash_bytes = stored_hash.encode('utf-8')
-    
-    if bcrypt.checkpw(password_bytes, hash_bytes):
+    try:
+        valid = verify_password(password, stored_hash)
+    except AuthBusyError as e:
+        return False, f"{e} Please try again."
+
+    if valid:
         return True, f"Welcome, {username}!"
     else:
         return False, "Invalid password."
@@ -68,8 +112,41 @@ def login_user(username, password):
 
 
 
-def migrate_users_from_file(conn, filepath="DATA/users.txt"):
-    """Migrate users from text file to database."""
+# Lines per executemany/commit when migrating users.txt; the ledger checkpoint
+# is written in the same transaction as each batch
+USER_BATCH_SIZE = 10_000
+
+
+def _parse_user_line(raw):
+    """(username, password_hash) for one users.txt line, or None if it is malformed."""
+    try:
+        line = raw.decode("utf-8").strip()
+    except UnicodeDecodeError:
+        return None
+    parts = line.split(',')
+    if len(parts) < 2:
+        return None
+    username, password_hash = parts[0].strip(), parts[1].strip()
+    # week 7 auth.py wrote the bytes repr: b'$2b$12$...'
+    if password_hash.startswith("b'") and password_hash.endswith("'"):
+        password_hash = password_hash[2:-1]
+    if not username or not password_hash.startswith("$2"):
+        return None
+    return username, password_hash
+
+
+def migrate_users_from_file(conn, filepath="DATA/users.txt", batch_size=USER_BATCH_SIZE):
+    """Migrate users from text file to database.
+
+    The file is read line by line and inserted in batches with executemany.
+    Progress is checkpointed in ingestion_ledger after every batch, so a rerun
+    after an interruption resumes where it stopped, and a rerun on an
+    unchanged file does nothing. Lines without a username and a bcrypt hash
+    are rejected (counted, not inserted).
+
+    Returns:
+        int: number of users inserted.
+    """
 
     # Accept both str and Path
     filepath = Path(filepath) if not isinstance(filepath, Path) else filepath
@@ -78,35 +155,55 @@ def migrate_users_from_file(conn, filepath="DATA/users.txt"):
         print(f"⚠️  File not found: {filepath}")
         print("   No users to migrate.")
         return 0
-    
+
+    action, start, end = plan_ingestion(conn, filepath.name, filepath)
+    if action == "skip":
+        print(f"✅ {filepath.name} unchanged since last migration")
+        return 0
+    if start:
+        print(f"   Resuming {filepath.name} at byte {start:,}")
+
     cursor = conn.cursor()
-    migrated_count = 0
-    
-    with open(filepath, 'r') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
+    sql = "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, 'user')"
+    migrated_count = rejected = existing = 0
+    t0 = time.perf_counter()
+
+    def flush(batch, offset):
+        nonlocal migrated_count, existing
+        cursor.executemany(sql, batch)
+        inserted = max(cursor.rowcount, 0)
+        migrated_count += inserted
+        existing += len(batch) - inserted
+        record_ingestion(conn, filepath.name, filepath, offset, inserted, complete=offset >= end)
+        conn.commit()
+
+    with open(filepath, 'rb') as f:
+        f.seek(start)
+        offset = start
+        batch = []
+        while offset < end:
+            raw = f.readline()
+            if not raw:
+                break
+            offset += len(raw)
+            if not raw.strip():
                 continue
-
-            # Parse line: username,password_hash
-            parts = line.split(',')
-            if len(parts) >= 2:
-                username = parts[0]
-                password_hash = parts[1]
-                
-                # Insert user (ignore if already exists)
-                try:
-                    cursor.execute(
-                        "INSERT OR IGNORE INTO users (username, password_hash, role) VALUES (?, ?, ?)",
-                        (username, password_hash, 'user')
-                    )
-                    if cursor.rowcount > 0:
-                        migrated_count += 1
-                except sqlite3.Error as e:
-                    print(f"Error migrating user {username}: {e}")
-    
-    conn.commit()
-    print(f"✅ Migrated {migrated_count} users from {filepath.name}")
+            user = _parse_user_line(raw)
+            if user is None:
+                rejected += 1
+                if rejected <= 5:
+                    print(f"⚠️  Rejected line at byte {offset - len(raw):,}: {raw[:60]!r}")
+                continue
+            batch.append(user)
+            if len(batch) >= batch_size:
+                flush(batch, offset)
+                batch = []
+        flush(batch, end)
+
+    elapsed = time.perf_counter() - t0
+    rate = (migrated_count + existing + rejected) / elapsed if elapsed else 0
+    print(f"✅ Migrated {migrated_count} users from {filepath.name} "
+          f"({existing} already existed, {rejected} rejected, {rate:,.0f} lines/s)")
     return migrated_count
 
 
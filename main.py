@@ -3,6 +3,7 @@ from app.data.schema import create_all_tables
 from app.services.user_services import register_user, login_user, migrate_users_from_file
 from app.data.incidents import insert_incident, get_all_incidents, get_incidents_by_type_count, get_high_severity_by_status, get_incident_types_with_many_cases 
 from app.services.setup import setup_database_complete 
+from app.services.sessions import login_with_session, validate_session, revoke_sessions
 
 def main():
     setup_database_complete()
@@ -25,6 +26,13 @@ def main():
         # Don't stop the demo if registration fails (e.g., UNIQUE constraint on username)
         print(f"Auth step skipped due to error: {type(e).__name__}: {e}")
 
+    # Session token: bcrypt once at login, then cheap token checks
+    success, token = login_with_session("alice", "SecurePass123!")
+    if success:
+        print(f"Session valid for: {validate_session(conn, token)}")
+        revoke_sessions(conn, [token])
+        print(f"After logout: {validate_session(conn, token)}")
+
     try:
         #4.Test CRUD 
         incident_id = insert_incident(
@@ -24,70 +24,162 @@ if not st.session_state.logged_in:
     st.stop()
 
 # ---- Imports that depend on the app code ----
-from app.data.db import connect_database
+from app.data.db import connect_database, pool_stats
+from app.data.cache import cache_stats
+from app.data.changes import frame_page, get_live_frame, latest_change, live_frame_stats
+from app.data.search import search_incidents, search_tickets
+from app.services.charts import (
+    BAR_CATEGORY_BUDGET,
+    LINE_POINT_BUDGET,
+    lttb,
+    plotly_express,
+    top_n_with_other,
+)
+from app.data.query_builder import distinct_values, fetch_filtered_page, grouped_counts
 from app.data.incidents import (
-    get_all_incidents,
     insert_incident,
     update_incident_status,
     delete_incident,
     get_incidents_by_type_count,
     get_high_severity_by_status,
+    get_incident_kpis,
+    get_incident_counts_over_time,
+)
+from app.data.datasets import (
+    get_datasets_by_category_count,
+    get_top_datasets_by_record_count,
+    get_dataset_kpis,
 )
 from app.data.tickets import (
-    get_all_tickets,
     insert_ticket,
     update_ticket_status,
     update_ticket_priority,
     delete_ticket,
     get_tickets_by_status_count,
+    get_ticket_kpis,
 )
 
 
-# ---- Small plotting helper (Plotly if installed) ----
-def _bar_chart(df: pd.DataFrame, x: str, y: str, title: str):
-    try:
-        import plotly.express as px
-
-        fig = px.bar(df, x=x, y=y, title=title)
-        st.plotly_chart(fig, use_container_width=True)
-    except Exception:
+# ---- Small plotting helpers (Plotly if installed) ----
+# Series are downsampled server-side first, so a chart never ships more than
+# its point budget to the browser (see app/services/charts.py).
+def _bar_chart(df: pd.DataFrame, x: str, y: str, title: str, max_bars: int = BAR_CATEGORY_BUDGET):
+    df = top_n_with_other(df, x, y, max_bars)
+    px = plotly_express()
+    if px is not None:
+        st.plotly_chart(px.bar(df, x=x, y=y, title=title), use_container_width=True)
+    else:
         st.subheader(title)
         st.bar_chart(df.set_index(x)[y])
 
 
-def _line_chart(df: pd.DataFrame, x: str, y: str, title: str):
-    try:
-        import plotly.express as px
-
-        fig = px.line(df, x=x, y=y, title=title)
-        st.plotly_chart(fig, use_container_width=True)
-    except Exception:
+def _line_chart(df: pd.DataFrame, x: str, y: str, title: str, max_points: int = LINE_POINT_BUDGET):
+    df = lttb(df, x, y, max_points)
+    px = plotly_express()
+    if px is not None:
+        st.plotly_chart(px.line(df, x=x, y=y, title=title), use_container_width=True)
+    else:
         st.subheader(title)
         st.line_chart(df.set_index(x)[y])
 
 
-# ---- Cached reads ----
-@st.cache_data(ttl=10)
-def _load_incidents() -> pd.DataFrame:
+# ---- Filtered reads (pushed down to SQL, see app/data/query_builder.py) ----
+def _filter_options(table: str, columns: list) -> dict:
     conn = connect_database()
     try:
-        return get_all_incidents(conn)
+        return {c: distinct_values(conn, table, c) for c in columns}
     finally:
         conn.close()
 
 
-@st.cache_data(ttl=10)
-def _load_tickets() -> pd.DataFrame:
+def _page_cursor(key: str, filters: dict):
+    """Current keyset cursor for a paged table; back to page 1 when filters change."""
+    if st.session_state.get(f"{key}_filters") != filters:
+        st.session_state[f"{key}_filters"] = filters
+        st.session_state[f"{key}_cursors"] = [None]
+    return st.session_state[f"{key}_cursors"][-1]
+
+
+def _is_unfiltered(filters: dict, options: dict) -> bool:
+    """True when every multiselect is empty or has all its options selected."""
+    return all(not v or set(v) == set(options[c]) for c, v in filters.items())
+
+
+def _table_page(conn, table: str, filters: dict, options: dict, cursor, page_size: int):
+    """One keyset page of the record table: (DataFrame, next cursor or None).
+
+    The unfiltered view is sliced from the process-wide live frame (loaded
+    once from the snapshot, then patched from the change feed, see
+    app/data/changes.py); filtered views are a SQL query.
+    """
+    if not _is_unfiltered(filters, options):
+        return fetch_filtered_page(conn, table, filters, before_id=cursor, page_size=page_size)
+    return frame_page(get_live_frame(conn, table), before_id=cursor, page_size=page_size)
+
+
+def _pager(key: str, next_cursor):
+    """Newer / Older buttons under a keyset-paged table."""
+    cursors = st.session_state[f"{key}_cursors"]
+    c1, c2, c3 = st.columns([1, 1, 4])
+    if c1.button("◀ Newer", key=f"{key}_newer", disabled=len(cursors) == 1):
+        cursors.pop()
+        st.rerun(scope="fragment")
+    if c2.button("Older ▶", key=f"{key}_older", disabled=next_cursor is None):
+        cursors.append(next_cursor)
+        st.rerun(scope="fragment")
+    c3.caption(f"Page {len(cursors)}")
+
+
+def _search_box(label: str, key: str, search_fn):
+    """Search input + paged results, backed by the FTS5 search API."""
+    c1, c2 = st.columns([4, 1])
+    with c1:
+        text = st.text_input(label, key=f"{key}_q", placeholder="e.g. phishing email")
+    with c2:
+        page = st.number_input("Page", min_value=1, step=1, key=f"{key}_page")
+    if not text.strip():
+        return
+
+    page_size = 20
     conn = connect_database()
     try:
-        return get_all_tickets(conn)
+        hits = search_fn(conn, text, limit=page_size, offset=(int(page) - 1) * page_size)
     finally:
         conn.close()
 
+    if hits.empty:
+        st.info("No matches.")
+    else:
+        st.dataframe(hits.drop(columns=["rank"]), use_container_width=True)
+
 
 def _refresh_data():
-    _load_incidents.clear()
-    _load_tickets.clear()
+    # Cached reads (app.data.cache) go stale on their own when their table is
+    # written, so there is nothing to clear; just jump back to the newest rows
+    for key in ("inc_table", "ticket_table", "ds_table"):
+        st.session_state.pop(f"{key}_cursors", None)
+        st.session_state.pop(f"{key}_filters", None)
+
+
+LIVE_REFRESH_SECONDS = 5
+
+
+@st.fragment(run_every=LIVE_REFRESH_SECONDS)
+def _watch_changes():
+    """Poll the change feed and rerun the page only when a domain table changed.
+
+    The rerun then patches the live frames with just the changed rows.
+    """
+    conn = connect_database()
+    try:
+        seq = latest_change(conn)
+    finally:
+        conn.close()
+    seen = st.session_state.setdefault("seen_change", seq)
+    if seq != seen:
+        st.session_state.seen_change = seq
+        st.rerun()
+    st.caption(f"🟢 Live: change #{seq}")
 
 
 # ---- Page header ----
@@ -102,10 +194,26 @@ with st.sidebar:
         _refresh_data()
         st.rerun()
 
+    if st.toggle(f"Live refresh (every {LIVE_REFRESH_SECONDS}s)", value=False):
+        _watch_changes()
+
     st.divider()
     st.subheader("Global filters")
     show_limit = st.slider("Rows to show", 10, 300, 50)
 
+    stats = pool_stats()
+    st.caption(f"DB pool: {stats['hits']} hits / {stats['misses']} misses ({stats['hit_rate']:.0%} reused)")
+    cstats = cache_stats()
+    st.caption(
+        f"Query cache: {cstats['entries']} entries, {cstats['bytes'] / 1e6:.1f} MB, "
+        f"{cstats['hit_rate']:.0%} hits"
+    )
+    lstats = live_frame_stats()
+    st.caption(
+        f"Live tables: {lstats['full_loads']} full loads, {lstats['patches']} patches "
+        f"({lstats['rows_patched']} rows)"
+    )
+
     st.divider()
     if st.button("Log out", use_container_width=True):
         st.session_state.logged_in = False
@@ -114,52 +222,43 @@ with st.sidebar:
 
 
 # =============================
-# Tabs for two completed domains
+# One function per domain view. Only the selected view runs, and each is a
+# fragment, so its own widgets rerun that view alone, not the whole page.
 # =============================
-inc_tab, ticket_tab = st.tabs(["🛡️ Cyber Incidents", "🎫 IT Tickets"])
-
 
 # -----------------------------
 # CIBERSECURITY: Incidents domain
 # -----------------------------
-with inc_tab:
-    incidents = _load_incidents()
+@st.fragment
+def _incidents_view(show_limit: int):
+    options = _filter_options("cyber_incidents", ["severity", "status", "incident_type"])
 
     # --- Filters ---
     c1, c2, c3 = st.columns(3)
     with c1:
-        sev_filter = st.multiselect(
-            "Severity",
-            options=sorted([x for x in incidents["severity"].dropna().unique()]),
-            default=sorted([x for x in incidents["severity"].dropna().unique()]),
-        )
+        sev_filter = st.multiselect("Severity", options=options["severity"], default=options["severity"])
     with c2:
-        status_filter = st.multiselect(
-            "Status",
-            options=sorted([x for x in incidents["status"].dropna().unique()]),
-            default=sorted([x for x in incidents["status"].dropna().unique()]),
-        )
+        status_filter = st.multiselect("Status", options=options["status"], default=options["status"])
     with c3:
         type_filter = st.multiselect(
-            "Incident type",
-            options=sorted([x for x in incidents["incident_type"].dropna().unique()]),
-            default=sorted([x for x in incidents["incident_type"].dropna().unique()]),
+            "Incident type", options=options["incident_type"], default=options["incident_type"]
         )
 
-    filt = incidents.copy()
-    if sev_filter:
-        filt = filt[filt["severity"].isin(sev_filter)]
-    if status_filter:
-        filt = filt[filt["status"].isin(status_filter)]
-    if type_filter:
-        filt = filt[filt["incident_type"].isin(type_filter)]
+    inc_filters = {"severity": sev_filter, "status": status_filter, "incident_type": type_filter}
+    cursor = _page_cursor("inc_table", inc_filters)
+    conn = connect_database()
+    try:
+        kpis = get_incident_kpis(conn, inc_filters)
+        inc_page, inc_next = _table_page(conn, "cyber_incidents", inc_filters, options, cursor, show_limit)
+    finally:
+        conn.close()
 
     # --- KPIs ---
     k1, k2, k3, k4 = st.columns(4)
-    k1.metric("Incidents (filtered)", int(len(filt)))
-    k2.metric("Open", int((filt["status"] == "Open").sum()))
-    k3.metric("High severity", int((filt["severity"] == "High").sum()))
-    k4.metric("Unique types", int(filt["incident_type"].nunique()))
+    k1.metric("Incidents (filtered)", kpis["total"])
+    k2.metric("Open", kpis["open"])
+    k3.metric("High severity", kpis["high_severity"])
+    k4.metric("Unique types", kpis["unique_types"])
 
     st.divider()
 
@@ -184,11 +283,27 @@ with inc_tab:
             conn.close()
         _bar_chart(high_by_status, x="status", y="count", title="High Severity Incidents by Status")
 
+    # Incidents over time (hourly buckets; LTTB keeps it within the point budget)
+    conn = connect_database()
+    try:
+        over_time = get_incident_counts_over_time(conn, bucket_seconds=3600)
+    finally:
+        conn.close()
+    if not over_time.empty:
+        _line_chart(over_time, x="bucket", y="count", title="Incidents over Time (hourly)")
+
+    st.divider()
+
+    # --- Search ---
+    st.subheader("Search incidents")
+    _search_box("Search incident descriptions", "inc_search", search_incidents)
+
     st.divider()
 
     # --- Table ---
     st.subheader("Incident records")
-    st.dataframe(filt.head(show_limit), use_container_width=True)
+    st.dataframe(inc_page, use_container_width=True)
+    _pager("inc_table", inc_next)
 
     st.divider()
 
@@ -254,42 +369,33 @@ with inc_tab:
 # -----------------------------
 # IT Tickets domain
 # -----------------------------
-with ticket_tab:
-    tickets = _load_tickets()
+@st.fragment
+def _tickets_view(show_limit: int):
+    options = _filter_options("it_tickets", ["priority", "status", "category"])
 
     c1, c2, c3 = st.columns(3)
     with c1:
-        prio_filter = st.multiselect(
-            "Priority",
-            options=sorted([x for x in tickets["priority"].dropna().unique()]),
-            default=sorted([x for x in tickets["priority"].dropna().unique()]),
-        )
+        prio_filter = st.multiselect("Priority", options=options["priority"], default=options["priority"])
     with c2:
-        status_filter = st.multiselect(
-            "Status",
-            options=sorted([x for x in tickets["status"].dropna().unique()]),
-            default=sorted([x for x in tickets["status"].dropna().unique()]),
-        )
+        status_filter = st.multiselect("Status", options=options["status"], default=options["status"])
     with c3:
-        cat_filter = st.multiselect(
-            "Category",
-            options=sorted([x for x in tickets["category"].dropna().unique()]),
-            default=sorted([x for x in tickets["category"].dropna().unique()]),
-        )
+        cat_filter = st.multiselect("Category", options=options["category"], default=options["category"])
 
-    tf = tickets.copy()
-    if prio_filter:
-        tf = tf[tf["priority"].isin(prio_filter)]
-    if status_filter:
-        tf = tf[tf["status"].isin(status_filter)]
-    if cat_filter:
-        tf = tf[tf["category"].isin(cat_filter)]
+    ticket_filters = {"priority": prio_filter, "status": status_filter, "category": cat_filter}
+    cursor = _page_cursor("ticket_table", ticket_filters)
+    conn = connect_database()
+    try:
+        kpis = get_ticket_kpis(conn, ticket_filters)
+        tk_page, tk_next = _table_page(conn, "it_tickets", ticket_filters, options, cursor, show_limit)
+        pr = grouped_counts(conn, "it_tickets", ticket_filters, "priority")
+    finally:
+        conn.close()
 
     k1, k2, k3, k4 = st.columns(4)
-    k1.metric("Tickets (filtered)", int(len(tf)))
-    k2.metric("Open", int((tf["status"] == "Open").sum()))
-    k3.metric("High priority", int((tf["priority"] == "High").sum()))
-    k4.metric("Unique categories", int(tf["category"].nunique()))
+    k1.metric("Tickets (filtered)", kpis["total"])
+    k2.metric("Open", kpis["open"])
+    k3.metric("High priority", kpis["high_priority"])
+    k4.metric("Unique categories", kpis["unique_categories"])
 
     st.divider()
 
@@ -303,18 +409,19 @@ with ticket_tab:
         _bar_chart(by_status, x="status", y="count", title="Tickets by Status")
 
     with v2:
-        # Tickets by priority (quick calculation)
-        pr = (
-            tf.groupby("priority", as_index=False)
-            .size()
-            .rename(columns={"size": "count"})
-        )
+        # Tickets by priority (filtered, counted in SQL above)
         _bar_chart(pr, x="priority", y="count", title="Tickets by Priority (filtered)")
 
     st.divider()
 
+    st.subheader("Search tickets")
+    _search_box("Search ticket subjects and descriptions", "ticket_search", search_tickets)
+
+    st.divider()
+
     st.subheader("Ticket records")
-    st.dataframe(tf.head(show_limit), use_container_width=True)
+    st.dataframe(tk_page, use_container_width=True)
+    _pager("ticket_table", tk_next)
 
     st.divider()
 
@@ -404,3 +511,57 @@ with ticket_tab:
                     st.success("Ticket deleted.")
                 _refresh_data()
                 st.rerun()
+
+
+# -----------------------------
+# Datasets domain (read-only view)
+# -----------------------------
+@st.fragment
+def _datasets_view(show_limit: int):
+    options = _filter_options("datasets_metadata", ["category", "source"])
+
+    c1, c2 = st.columns(2)
+    with c1:
+        cat_filter = st.multiselect("Category", options=options["category"], default=options["category"], key="ds_category")
+    with c2:
+        src_filter = st.multiselect("Source", options=options["source"], default=options["source"], key="ds_source")
+
+    ds_filters = {"category": cat_filter, "source": src_filter}
+    cursor = _page_cursor("ds_table", ds_filters)
+    conn = connect_database()
+    try:
+        kpis = get_dataset_kpis(conn, ds_filters)
+        ds_page, ds_next = _table_page(conn, "datasets_metadata", ds_filters, options, cursor, show_limit)
+        by_category = get_datasets_by_category_count(conn)
+        top = get_top_datasets_by_record_count(conn, limit=10)
+    finally:
+        conn.close()
+
+    k1, k2, k3 = st.columns(3)
+    k1.metric("Datasets (filtered)", kpis["total"])
+    k2.metric("Categories", kpis["unique_categories"])
+    k3.metric("Sources", kpis["unique_sources"])
+
+    st.divider()
+
+    v1, v2 = st.columns(2)
+    with v1:
+        _bar_chart(by_category, x="category", y="count", title="Datasets by Category")
+    with v2:
+        _bar_chart(top, x="dataset_name", y="record_count", title="Largest Datasets (records)")
+
+    st.divider()
+
+    st.subheader("Dataset records")
+    st.dataframe(ds_page, use_container_width=True)
+    _pager("ds_table", ds_next)
+
+
+VIEWS = {
+    "🛡️ Cyber Incidents": _incidents_view,
+    "🎫 IT Tickets": _tickets_view,
+    "🗂️ Datasets": _datasets_view,
+}
+
+view = st.radio("View", list(VIEWS), horizontal=True, key="dashboard_view", label_visibility="collapsed")
+VIEWS[view](show_limit)
@@ -0,0 +1,39 @@
+import shutil
+from pathlib import Path
+
+import pytest
+
+from app.data.db import close_all_connections, connect_database
+from app.data.schema import create_all_tables
+
+REPO_DATA = Path(__file__).resolve().parents[1] / "DATA"
+CSV_FILES = ("cyber_incidents.csv", "datasets_metadata.csv", "it_tickets.csv")
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "test.db"
+
+
+@pytest.fixture
+def conn(db_path):
+    """A pooled connection to a fresh database with the full schema."""
+    conn = connect_database(db_path)
+    create_all_tables(conn)
+    yield conn
+    conn.close()
+    close_all_connections()
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    """Private copy of the shipped CSV exports (tests may edit them)."""
+    out = tmp_path / "csv"
+    out.mkdir()
+    for name in CSV_FILES:
+        shutil.copy(REPO_DATA / name, out / name)
+    return out
+
+
+def count_rows(conn, table):
+    return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
@@ -0,0 +1,33 @@
+import threading
+
+import bcrypt
+
+from app.services import auth_service
+from app.services.auth_service import hash_password, hash_passwords, verify_password
+
+
+def test_login_is_not_queued_behind_a_batch(monkeypatch):
+    release = threading.Event()
+    real_hashpw = bcrypt.hashpw
+
+    def slow_hashpw(password, salt):
+        # Batch hashes hold their worker until the logins below have finished
+        assert release.wait(timeout=30)
+        return real_hashpw(password, salt)
+
+    stored = hash_password("secret", rounds=4)
+    monkeypatch.setattr(auth_service, "REQUEST_TIMEOUT_S", 5)
+    monkeypatch.setattr(auth_service.bcrypt, "hashpw", slow_hashpw)
+
+    result = {}
+    batch = threading.Thread(target=lambda: result.update(hashes=hash_passwords(["pw"] * 20, rounds=4)))
+    batch.start()
+    try:
+        assert verify_password("secret", stored)
+        assert not verify_password("wrong", stored)
+    finally:
+        release.set()
+        batch.join(timeout=30)
+
+    assert len(result["hashes"]) == 20
+    assert bcrypt.checkpw(b"pw", result["hashes"][0].encode("utf-8"))
@@ -0,0 +1,56 @@
+import pytest
+
+from app.data.incidents import insert_incidents
+from tests.conftest import count_rows
+
+
+def _row(incident_id, status="Open", description="First"):
+    return {
+        "date": "2024-12-01 10:00:00", "incident_type": "Phishing", "severity": "High",
+        "status": status, "description": description, "reported_by": None, "incident_id": incident_id,
+    }
+
+
+def _incident(conn, incident_id):
+    return conn.execute(
+        "SELECT id, status, description FROM cyber_incidents WHERE incident_id = ?", (incident_id,)
+    ).fetchone()
+
+
+def test_plain_insert_returns_new_ids_in_order(conn):
+    ids = insert_incidents(conn, [_row(1), _row(2), _row(3)])
+    assert ids == [_incident(conn, k)[0] for k in (1, 2, 3)]
+
+
+def test_plain_insert_rolls_back_on_duplicate_key(conn):
+    insert_incidents(conn, [_row(1)])
+    with pytest.raises(Exception):
+        insert_incidents(conn, [_row(2), _row(1)])
+    assert count_rows(conn, "cyber_incidents") == 1
+
+
+def test_ignore_keeps_existing_row_and_returns_its_id(conn):
+    [first] = insert_incidents(conn, [_row(1)])
+    ids = insert_incidents(conn, [_row(1, description="Second"), _row(2)], on_conflict="ignore")
+    assert ids[0] == first
+    assert _incident(conn, 1)[2] == "First"
+    assert count_rows(conn, "cyber_incidents") == 2
+
+
+def test_replace_overwrites_every_column(conn):
+    [first] = insert_incidents(conn, [_row(1, status="Open", description="First")])
+    new = _row(1, status="Closed", description=None)
+    assert insert_incidents(conn, [new], on_conflict="replace") == [first]
+    assert _incident(conn, 1) == (first, "Closed", None)
+
+
+def test_upsert_merges_only_given_columns(conn):
+    [first] = insert_incidents(conn, [_row(1, status="Open", description="First")])
+    new = _row(1, status="Closed", description=None)
+    assert insert_incidents(conn, [new], on_conflict="upsert") == [first]
+    assert _incident(conn, 1) == (first, "Closed", "First")
+
+
+def test_unknown_conflict_mode_is_rejected(conn):
+    with pytest.raises(ValueError):
+        insert_incidents(conn, [_row(1)], on_conflict="merge")
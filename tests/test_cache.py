@@ -0,0 +1,53 @@
+import pytest
+
+from app.data.cache import cache_stats, cached_query, clear_cache
+from app.data.incidents import insert_incident
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    clear_cache()
+    yield
+    clear_cache()
+
+
+INCIDENTS_SQL = "SELECT COUNT(*) AS n FROM cyber_incidents"
+TICKETS_SQL = "SELECT COUNT(*) AS n FROM it_tickets"
+
+
+def _count(conn, sql, table):
+    return int(cached_query(conn, sql, tables=(table,))["n"].iloc[0])
+
+
+def test_repeat_reads_are_cache_hits(conn):
+    _count(conn, INCIDENTS_SQL, "cyber_incidents")
+    hits = cache_stats()["hits"]
+    _count(conn, INCIDENTS_SQL, "cyber_incidents")
+    assert cache_stats()["hits"] == hits + 1
+
+
+def test_write_invalidates_only_its_own_table(conn):
+    assert _count(conn, INCIDENTS_SQL, "cyber_incidents") == 0
+    _count(conn, TICKETS_SQL, "it_tickets")
+
+    insert_incident(conn, "2024-12-01", "Phishing", "High", "Open", "New", None)
+    before = cache_stats()
+
+    assert _count(conn, INCIDENTS_SQL, "cyber_incidents") == 1
+    _count(conn, TICKETS_SQL, "it_tickets")
+    after = cache_stats()
+    assert after["stale"] == before["stale"] + 1
+    assert after["hits"] == before["hits"] + 1
+
+
+def test_cache_is_bypassed_inside_a_transaction(conn):
+    _count(conn, INCIDENTS_SQL, "cyber_incidents")
+    conn.execute(
+        "INSERT INTO cyber_incidents (incident_type, severity, description) VALUES ('Malware', 'Low', 'x')"
+    )
+    bypassed = cache_stats()["bypassed"]
+    # Sees the uncommitted row, and does not cache it
+    assert _count(conn, INCIDENTS_SQL, "cyber_incidents") == 1
+    assert cache_stats()["bypassed"] == bypassed + 1
+    conn.rollback()
+    assert _count(conn, INCIDENTS_SQL, "cyber_incidents") == 0
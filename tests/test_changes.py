@@ -0,0 +1,70 @@
+import pytest
+
+from app.data.changes import frame_page, get_live_frame, live_frame_stats
+from app.data.incidents import delete_incident, insert_incident
+from app.data.loader import load_all_csv_data
+from app.data.query_builder import fetch_filtered_page
+from app.data.snapshots import snapshots_available, write_all_snapshots
+
+
+def test_live_frame_is_patched_from_the_change_feed(conn, data_dir):
+    load_all_csv_data(conn, data_dir=data_dir, bulk=False)
+    df = get_live_frame(conn, "cyber_incidents")
+    assert len(df) == 115
+    before = live_frame_stats()
+
+    new_id = insert_incident(conn, "2024-12-01", "Phishing", "High", "Open", "Live row", None)
+    delete_incident(conn, int(df["id"].iloc[-1]))
+    df = get_live_frame(conn, "cyber_incidents")
+
+    after = live_frame_stats()
+    assert after["full_loads"] == before["full_loads"]
+    assert after["patches"] == before["patches"] + 1
+    assert len(df) == 115 and df["id"].iloc[0] == new_id
+
+
+def test_live_frame_reloads_after_a_bulk_load(conn, data_dir):
+    get_live_frame(conn, "it_tickets")
+    before = live_frame_stats()["full_loads"]
+
+    load_all_csv_data(conn, data_dir=data_dir, bulk=True)
+    df = get_live_frame(conn, "it_tickets")
+
+    assert live_frame_stats()["full_loads"] == before + 1
+    assert len(df) == 150
+
+
+def test_frame_page_matches_the_sql_keyset_page(conn, data_dir):
+    load_all_csv_data(conn, data_dir=data_dir, bulk=False)
+    df = get_live_frame(conn, "it_tickets")
+
+    cursor, pages = None, 0
+    while True:
+        page, next_cursor = frame_page(df, before_id=cursor, page_size=40)
+        expected, expected_cursor = fetch_filtered_page(conn, "it_tickets", {}, before_id=cursor, page_size=40)
+        assert page["id"].tolist() == expected["id"].tolist()
+        assert next_cursor == expected_cursor
+        pages += 1
+        if next_cursor is None:
+            break
+        cursor = next_cursor
+    assert pages == 4
+
+    # A cursor that is not an existing id still starts below it
+    page, _ = frame_page(df, before_id=int(df["id"].iloc[9]) + 0.5, page_size=5)
+    assert page["id"].iloc[0] == df["id"].iloc[9]
+
+
+@pytest.mark.skipif(not snapshots_available(), reason="pyarrow not installed")
+def test_patching_keeps_the_snapshot_dtypes(conn, data_dir):
+    load_all_csv_data(conn, data_dir=data_dir, bulk=False)
+    write_all_snapshots(conn)
+    before = get_live_frame(conn, "cyber_incidents").dtypes
+
+    insert_incident(conn, "2024-12-01", "Phishing", "High", "Open", "Live row", None)
+    after = get_live_frame(conn, "cyber_incidents").dtypes
+
+    changed = {c: (before[c], after[c]) for c in before.index if before[c] != after[c]}
+    # The new row has no incident_id, so that column can only widen to float
+    assert set(changed) <= {"incident_id"}
+    assert "object" not in {str(d) for d in after}
@@ -0,0 +1,25 @@
+import numpy as np
+import pandas as pd
+
+from app.data.dtypes import compact_frame
+
+
+def test_id_columns_keep_at_least_32_bits():
+    df = pd.DataFrame({"id": [1, 2, 3], "incident_id": [1000.0, np.nan, 1002.0], "count": [1, 2, 3]})
+    out = compact_frame(df, "cyber_incidents")
+    assert out["id"].dtype == np.int32
+    assert str(out["incident_id"].dtype) == "Int32"
+    assert out["count"].dtype == np.int8
+
+
+def test_only_listed_float_columns_become_nullable_int():
+    df = pd.DataFrame({
+        "record_count": [10.0, np.nan],
+        "file_size_mb": [2.0, 3.0],       # integral values, but a REAL column
+        "extra": [np.nan, np.nan],         # all NULL
+    })
+    out = compact_frame(df, "datasets_metadata")
+    assert str(out["record_count"].dtype).startswith("Int")
+    assert out["file_size_mb"].dtype == np.float64
+    assert out["record_count"].isna().sum() == 1
+    assert out["extra"].dtype == np.float64
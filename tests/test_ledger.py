@@ -0,0 +1,72 @@
+from app.data.ledger import complete_offset, plan_ingestion, record_ingestion
+from app.data.loader import load_all_csv_data
+from tests.conftest import CSV_FILES, count_rows
+
+
+def _strip_final_newline(path):
+    path.write_bytes(path.read_bytes().rstrip(b"\n"))
+
+
+def test_complete_offset_stops_before_unterminated_line(tmp_path):
+    path = tmp_path / "f.csv"
+    path.write_bytes(b"a\nb\nc")
+    assert complete_offset(path) == 4
+
+
+def test_unterminated_last_line_is_loaded_when_file_is_stable(conn, tmp_path):
+    path = tmp_path / "f.csv"
+    path.write_bytes(b"h\n1\n2")
+    action, start, end = plan_ingestion(conn, "f.csv", path)
+    assert (action, start, end) == ("full", 0, path.stat().st_size)
+
+
+def test_csv_without_trailing_newline_loads_every_row(conn, data_dir):
+    expected = {"cyber_incidents": 115, "datasets_metadata": 5, "it_tickets": 150}
+    for name in CSV_FILES:
+        _strip_final_newline(data_dir / name)
+
+    load_all_csv_data(conn, data_dir=data_dir)
+    assert {t: count_rows(conn, t) for t in expected} == expected
+
+    # A second run must skip, not lose or duplicate anything
+    assert load_all_csv_data(conn, data_dir=data_dir) == 0
+    assert {t: count_rows(conn, t) for t in expected} == expected
+
+
+def test_checkpoint_before_unterminated_tail_is_resumed(conn, tmp_path):
+    # Ledgers written before the fix stored the full size with a short offset
+    path = tmp_path / "f.csv"
+    path.write_bytes(b"h\n1\n2")
+    record_ingestion(conn, "f.csv", path, complete_offset(path), 1)
+    assert plan_ingestion(conn, "f.csv", path) == ("append", 4, 5)
+
+
+def test_unchanged_file_is_skipped(conn, data_dir):
+    load_all_csv_data(conn, data_dir=data_dir)
+    path = data_dir / "it_tickets.csv"
+    action, _, _ = plan_ingestion(conn, "it_tickets.csv", path)
+    assert action == "skip"
+
+
+def test_append_loads_only_new_rows(conn, data_dir):
+    load_all_csv_data(conn, data_dir=data_dir)
+    path = data_dir / "cyber_incidents.csv"
+    with open(path, "a") as f:
+        f.write("9001,2024-12-01 10:00:00,High,Phishing,Open,Appended row\n")
+
+    action, start, _ = plan_ingestion(conn, "cyber_incidents.csv", path)
+    assert action == "append" and start > 0
+    assert load_all_csv_data(conn, data_dir=data_dir) == 1
+    assert count_rows(conn, "cyber_incidents") == 116
+
+
+def test_rewritten_file_is_reloaded_without_duplicates(conn, data_dir):
+    load_all_csv_data(conn, data_dir=data_dir)
+    path = data_dir / "datasets_metadata.csv"
+    lines = path.read_text().splitlines(keepends=True)
+    path.write_text(lines[0] + "".join(reversed(lines[1:])))
+
+    action, start, _ = plan_ingestion(conn, "datasets_metadata.csv", path)
+    assert (action, start) == ("full", 0)
+    load_all_csv_data(conn, data_dir=data_dir)
+    assert count_rows(conn, "datasets_metadata") == 5
@@ -0,0 +1,105 @@
+from app.data.loader import load_all_csv_data
+from tests.conftest import count_rows
+
+
+def _append(path, line):
+    with open(path, "a") as f:
+        f.write(line + "\n")
+
+
+def test_rows_without_natural_key_are_skipped(conn, data_dir):
+    _append(data_dir / "cyber_incidents.csv", ",2024-12-01 10:00:00,High,Phishing,Open,No id")
+    _append(data_dir / "it_tickets.csv", ",High,No id,Open,IT Support,2024-12-01 10:00:00,4")
+
+    load_all_csv_data(conn, data_dir=data_dir)
+    assert count_rows(conn, "cyber_incidents") == 115
+    assert count_rows(conn, "it_tickets") == 150
+    assert conn.execute("SELECT COUNT(*) FROM it_tickets WHERE ticket_id IS NULL OR ticket_id = 'nan'").fetchone()[0] == 0
+
+
+def test_full_reload_does_not_duplicate_rows(conn, data_dir):
+    load_all_csv_data(conn, data_dir=data_dir)
+    conn.execute("DELETE FROM ingestion_ledger")
+    conn.commit()
+    # Ledger gone but tables populated: adopted, not re-imported
+    load_all_csv_data(conn, data_dir=data_dir)
+    assert count_rows(conn, "cyber_incidents") == 115
+
+    # A rewritten file is re-upserted in full onto the same keys
+    path = data_dir / "cyber_incidents.csv"
+    path.write_text(path.read_text().replace("Incident 0 description", "Edited"))
+    load_all_csv_data(conn, data_dir=data_dir)
+    assert count_rows(conn, "cyber_incidents") == 115
+    assert conn.execute("SELECT COUNT(*) FROM cyber_incidents WHERE description = 'Edited'").fetchone()[0] == 1
+
+
+def test_chunked_load_matches_whole_file_load(conn, data_dir):
+    load_all_csv_data(conn, data_dir=data_dir)
+    whole = conn.execute("SELECT incident_id, date, severity FROM cyber_incidents ORDER BY incident_id").fetchall()
+
+    conn.execute("DELETE FROM ingestion_ledger")
+    conn.execute("DELETE FROM cyber_incidents")
+    conn.commit()
+    # Other tables still hold data, so their files are adopted, not reloaded
+    assert load_all_csv_data(conn, chunksize=7, data_dir=data_dir) == 115
+    chunked = conn.execute("SELECT incident_id, date, severity FROM cyber_incidents ORDER BY incident_id").fetchall()
+    assert chunked == whole
+
+
+def _baseline_incidents_db(db_path, data_dir):
+    """A database as the original loader left it: no incident_id, rows in file order."""
+    import sqlite3
+
+    import pandas as pd
+
+    raw = sqlite3.connect(db_path)
+    raw.execute("""
+        CREATE TABLE cyber_incidents(
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            date TEXT,
+            incident_type TEXT NOT NULL,
+            severity TEXT NOT NULL,
+            status TEXT DEFAULT 'open',
+            description TEXT,
+            reported_by TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+    df = pd.read_csv(data_dir / "cyber_incidents.csv")
+    out = pd.DataFrame({
+        "date": df["timestamp"].astype(str),
+        "incident_type": df["category"].astype(str),
+        "severity": df["severity"].astype(str),
+        "status": df["status"].astype(str),
+        "description": df["description"].astype(str),
+        "reported_by": None,
+    })
+    out.to_sql("cyber_incidents", raw, if_exists="append", index=False)
+    raw.commit()
+    raw.close()
+
+
+def test_baseline_database_is_not_duplicated_by_a_full_reload(db_path, data_dir):
+    from app.data.db import close_all_connections, connect_database
+    from app.data.incidents import insert_incident
+    from app.data.schema import create_all_tables
+
+    _baseline_incidents_db(db_path, data_dir)
+    conn = connect_database(db_path)
+    try:
+        create_all_tables(conn)
+        load_all_csv_data(conn, data_dir=data_dir)   # adopts cyber_incidents
+        assert conn.execute("SELECT COUNT(*) FROM cyber_incidents WHERE incident_id IS NULL").fetchone()[0] == 0
+        insert_incident(conn, "2024-12-01", "Phishing", "High", "Open", "Made in the dashboard")
+
+        path = data_dir / "cyber_incidents.csv"
+        path.write_text(path.read_text().replace("Incident 0 description", "Edited"))
+        load_all_csv_data(conn, data_dir=data_dir)
+
+        assert count_rows(conn, "cyber_incidents") == 116
+        assert conn.execute(
+            "SELECT description FROM cyber_incidents WHERE incident_id = 1000"
+        ).fetchone()[0] == "Edited"
+    finally:
+        conn.close()
+        close_all_connections()
@@ -0,0 +1,49 @@
+import signal
+import sqlite3
+
+import pytest
+
+from app.data.pipeline import run_ingestion_pipeline
+from tests.conftest import count_rows
+
+
+@pytest.fixture(autouse=True)
+def watchdog():
+    """Fail instead of hanging the test run if the pipeline never returns."""
+    def timeout(signum, frame):
+        raise TimeoutError("run_ingestion_pipeline hung")
+    previous = signal.signal(signal.SIGALRM, timeout)
+    signal.alarm(60)
+    yield
+    signal.alarm(0)
+    signal.signal(signal.SIGALRM, previous)
+
+
+def test_pipeline_loads_every_source(conn, data_dir):
+    stats = run_ingestion_pipeline(conn, chunksize=20, workers=3, data_dir=data_dir)
+    assert {t: s["rows"] for t, s in stats.items()} == {
+        "cyber_incidents": 115, "datasets_metadata": 5, "it_tickets": 150,
+    }
+    assert count_rows(conn, "it_tickets") == 150
+
+
+def test_writer_error_stops_the_workers_and_raises(conn, data_dir, monkeypatch):
+    calls = []
+
+    def executemany(sql, rows):
+        calls.append(sql)
+        if len(calls) == 2:
+            raise sqlite3.OperationalError("database is locked")
+        return sqlite3.Connection.executemany(conn, sql, rows)
+
+    monkeypatch.setattr(conn, "executemany", executemany)
+    # 5-row chunks: far more chunks per file than the queue holds
+    with pytest.raises(sqlite3.OperationalError, match="locked"):
+        run_ingestion_pipeline(conn, chunksize=5, workers=3, data_dir=data_dir)
+
+
+def test_worker_error_stops_the_other_workers_and_raises(conn, data_dir):
+    path = data_dir / "cyber_incidents.csv"
+    path.write_text(path.read_text().replace("timestamp", "when", 1))
+    with pytest.raises(KeyError):
+        run_ingestion_pipeline(conn, chunksize=5, workers=3, data_dir=data_dir)
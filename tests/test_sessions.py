@@ -0,0 +1,68 @@
+import pytest
+
+from app.services import sessions
+from app.services.sessions import (
+    create_session,
+    revoke_sessions,
+    revoke_user_sessions,
+    session_stats,
+    sweep_expired_sessions,
+    validate_session,
+)
+
+
+@pytest.fixture(autouse=True)
+def session_secret(monkeypatch):
+    monkeypatch.setenv("SESSION_SECRET", "test-secret")
+    sessions._secret.cache_clear()
+    sessions._cache.clear()
+    yield
+    sessions._secret.cache_clear()
+    sessions._cache.clear()
+
+
+def test_valid_token_is_served_from_memory(conn):
+    token = create_session(conn, "alice")
+    before = session_stats()
+    assert validate_session(conn, token) == "alice"
+    assert session_stats()["hits"] == before["hits"] + 1
+
+
+def test_forged_token_is_rejected(conn):
+    token_id, expires_at, signature = create_session(conn, "alice").split(".")
+    before = session_stats()["rejected"]
+    assert validate_session(conn, f"{token_id}.{int(expires_at) + 3600}.{signature}") is None
+    assert validate_session(conn, "not-a-token") is None
+    assert session_stats()["rejected"] == before + 2
+
+
+def test_expired_token_is_rejected(conn):
+    token = create_session(conn, "alice", ttl_s=-1)
+    assert validate_session(conn, token) is None
+
+
+def test_revoked_tokens_are_rejected(conn):
+    t1, t2 = create_session(conn, "alice"), create_session(conn, "alice")
+    t3 = create_session(conn, "bob")
+    assert revoke_sessions(conn, [t1]) == 1
+    assert validate_session(conn, t1) is None
+    assert revoke_user_sessions(conn, "alice") == 1
+    assert validate_session(conn, t2) is None
+    assert validate_session(conn, t3) == "bob"
+
+
+def test_revocation_from_another_process_is_seen_after_cache_ttl(conn, monkeypatch):
+    token = create_session(conn, "alice")
+    conn.execute("UPDATE sessions SET revoked = 1")
+    conn.commit()
+    assert validate_session(conn, token) == "alice"  # still trusted from memory
+    monkeypatch.setattr(sessions, "CACHE_TTL_S", 0)
+    assert validate_session(conn, token) is None
+
+
+def test_sweep_deletes_expired_and_revoked_sessions(conn):
+    create_session(conn, "alice", ttl_s=-1)
+    revoke_sessions(conn, [create_session(conn, "bob")])
+    keep = create_session(conn, "carol")
+    assert sweep_expired_sessions(conn, batch_size=1) == 2
+    assert validate_session(conn, keep) == "carol"
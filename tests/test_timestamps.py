@@ -0,0 +1,25 @@
+import pandas as pd
+
+from app.data.loader import load_all_csv_data
+from app.data.timestamps import normalise_series, to_epoch, to_iso
+
+
+def test_offset_values_are_stored_in_utc():
+    assert to_iso("2024-01-01 05:00:00+02:00") == "2024-01-01 03:00:00"
+    assert to_epoch("2024-01-01 05:00:00+02:00") == to_epoch("2024-01-01 03:00:00")
+
+
+def test_column_mixing_offset_and_naive_values():
+    iso, epoch = normalise_series(pd.Series(["2024-01-01 05:00:00+02:00", "2024-01-01 03:00:00", "junk"]))
+    assert list(iso) == ["2024-01-01 03:00:00", "2024-01-01 03:00:00", "junk"]
+    assert epoch[0] == epoch[1] == to_epoch("2024-01-01 03:00:00")
+    assert pd.isna(epoch[2])
+
+
+def test_load_with_mixed_timezones_keeps_every_row(conn, data_dir):
+    path = data_dir / "cyber_incidents.csv"
+    with open(path, "a") as f:
+        f.write("9001,2024-12-01 12:00:00+02:00,High,Phishing,Open,Offset row\n")
+    load_all_csv_data(conn, data_dir=data_dir)
+    row = conn.execute("SELECT date, date_epoch FROM cyber_incidents WHERE incident_id = 9001").fetchone()
+    assert row == ("2024-12-01 10:00:00", to_epoch("2024-12-01 10:00:00"))
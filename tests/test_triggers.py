@@ -0,0 +1,79 @@
+from app.data.aggregates import check_aggregates
+from app.data.bulk import bulk_insert, to_frame
+from app.data.changes import get_changes_since, latest_change
+from app.data.db import get_table_version
+from app.data.loader import load_all_csv_data
+from app.data.pipeline import run_ingestion_pipeline
+from app.data.schema import create_all_tables
+from app.data.search import search_incidents
+from app.data.triggers import suspend_triggers
+
+
+def _trigger_names(conn, table):
+    sql = "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ? ORDER BY name"
+    return [r[0] for r in conn.execute(sql, (table,))]
+
+
+def _assert_caught_up(conn):
+    assert check_aggregates(conn) == {"incident_counts": 0, "ticket_counts": 0}
+    assert len(search_incidents(conn, "Incident 42 description", limit=5)) >= 1
+    assert conn.execute("SELECT COUNT(*) FROM suspended_triggers").fetchone()[0] == 0
+
+
+def test_bulk_load_catches_up_derived_tables(conn, data_dir):
+    triggers = _trigger_names(conn, "cyber_incidents")
+    version = get_table_version(conn, "cyber_incidents")
+    since = latest_change(conn)
+
+    load_all_csv_data(conn, data_dir=data_dir, bulk=True)
+
+    assert _trigger_names(conn, "cyber_incidents") == triggers
+    _assert_caught_up(conn)
+    # One version bump and one 'R' change per table, not one per row
+    assert get_table_version(conn, "cyber_incidents") == version + 1
+    ops = conn.execute(
+        "SELECT op, COUNT(*) FROM change_log WHERE table_name = 'cyber_incidents' AND seq > ? GROUP BY op",
+        (since,)
+    ).fetchall()
+    assert ops == [("R", 1)]
+    assert get_changes_since(conn, "cyber_incidents", since) is None
+
+
+def test_bulk_and_per_row_loads_give_the_same_aggregates(conn, data_dir):
+    load_all_csv_data(conn, data_dir=data_dir, bulk=False)
+    per_row = conn.execute("SELECT * FROM incident_counts ORDER BY 1, 2, 3").fetchall()
+    conn.execute("DELETE FROM ingestion_ledger")
+    conn.execute("DELETE FROM cyber_incidents")
+    conn.commit()
+    load_all_csv_data(conn, data_dir=data_dir, bulk=True)
+    assert conn.execute("SELECT * FROM incident_counts ORDER BY 1, 2, 3").fetchall() == per_row
+
+
+def test_bulk_insert_with_triggers_suspended(conn):
+    df = to_frame(
+        [(5000 + i, "Phishing", "High", "Open", f"Bulk row {i}") for i in range(50)],
+        ["incident_id", "incident_type", "severity", "status", "description"],
+    )
+    ids = bulk_insert(conn, "cyber_incidents", df, "incident_id", bulk=True)
+    assert len(ids) == 50
+    assert check_aggregates(conn) == {"incident_counts": 0, "ticket_counts": 0}
+    assert len(search_incidents(conn, "Bulk row", limit=100)) == 50
+
+
+def test_interrupted_bulk_load_is_repaired_on_startup(conn, data_dir):
+    suspend_triggers(conn, "cyber_incidents")
+    conn.commit()
+    assert _trigger_names(conn, "cyber_incidents") == []
+
+    # Rows written while the triggers were gone
+    load_all_csv_data(conn, data_dir=data_dir, bulk=False)
+    create_all_tables(conn)
+
+    assert "trg_cyber_incidents_version_insert" in _trigger_names(conn, "cyber_incidents")
+    _assert_caught_up(conn)
+
+
+def test_pipeline_bulk_load(conn, data_dir):
+    stats = run_ingestion_pipeline(conn, chunksize=50, workers=2, data_dir=data_dir, bulk=True)
+    assert stats["cyber_incidents"]["rows"] == 115
+    _assert_caught_up(conn)
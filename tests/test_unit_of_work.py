@@ -0,0 +1,51 @@
+import pytest
+
+from app.data.db import unit_of_work, unit_of_work_stats
+from app.data.incidents import insert_incident, update_incident_status
+from tests.conftest import count_rows
+
+
+def _insert(conn, description):
+    return insert_incident(conn, "2024-12-01", "Phishing", "High", "Open", description)
+
+
+def test_unit_commits_once_at_the_end(conn):
+    before = unit_of_work_stats()
+    with unit_of_work(conn):
+        new_id = _insert(conn, "a")
+        _insert(conn, "b")
+        update_incident_status(conn, new_id, "Closed")
+        assert conn.in_transaction
+    assert not conn.in_transaction
+    assert count_rows(conn, "cyber_incidents") == 2
+    assert unit_of_work_stats()["commits_saved"] == before["commits_saved"] + 2
+
+
+def test_error_rolls_back_the_whole_unit(conn):
+    with pytest.raises(RuntimeError):
+        with unit_of_work(conn):
+            _insert(conn, "a")
+            raise RuntimeError("boom")
+    assert count_rows(conn, "cyber_incidents") == 0
+
+
+def test_savepoint_rolls_back_only_its_block(conn):
+    with unit_of_work(conn) as uow:
+        _insert(conn, "kept")
+        with pytest.raises(RuntimeError):
+            with uow.savepoint():
+                _insert(conn, "dropped")
+                raise RuntimeError("boom")
+        _insert(conn, "also kept")
+    rows = [r[0] for r in conn.execute("SELECT description FROM cyber_incidents ORDER BY id")]
+    assert rows == ["kept", "also kept"]
+
+
+def test_nested_unit_acts_as_savepoint(conn):
+    with unit_of_work(conn):
+        _insert(conn, "outer")
+        with pytest.raises(RuntimeError):
+            with unit_of_work(conn):
+                _insert(conn, "inner")
+                raise RuntimeError("boom")
+    assert count_rows(conn, "cyber_incidents") == 1
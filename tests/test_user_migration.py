@@ -0,0 +1,28 @@
+from app.services.user_services import migrate_users_from_file
+
+HASH = "$2b$12$" + "a" * 53
+
+
+def _usernames(conn):
+    return [r[0] for r in conn.execute("SELECT username FROM users ORDER BY username")]
+
+
+def test_last_user_migrates_without_trailing_newline(conn, tmp_path):
+    path = tmp_path / "users.txt"
+    path.write_text("\n".join(f"user{i},b'{HASH}'" for i in range(3)))
+
+    assert migrate_users_from_file(conn, path) == 3
+    assert _usernames(conn) == ["user0", "user1", "user2"]
+    # Unchanged file: nothing to do on the next run
+    assert migrate_users_from_file(conn, path) == 0
+
+
+def test_migration_resumes_after_appended_lines(conn, tmp_path):
+    path = tmp_path / "users.txt"
+    path.write_text(f"user0,{HASH}\n")
+    assert migrate_users_from_file(conn, path) == 1
+
+    with open(path, "a") as f:
+        f.write(f"user1,{HASH}\nnot a user line\nuser2,{HASH}")
+    assert migrate_users_from_file(conn, path) == 2
+    assert _usernames(conn) == ["user0", "user1", "user2"]
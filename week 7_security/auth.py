@@ -22,22 +22,68 @@ def verify_password(plain_text_password, hashed_password):
     return bcrypt.checkpw(password_bytes, hashed_password_bytes)
 
 
+# In-memory username -> hash index of users.txt, so a login is a dict lookup
+# instead of a scan of the whole file. It is rebuilt only when the file's
+# mtime or size changes (e.g. someone edited it), and register_user adds to it.
+_user_index = {}
+_index_stamp = None
+
+
+def _file_stamp():
+    """(mtime, size) of the user file, or None if it doesn't exist yet."""
+    try:
+        st = os.stat(USER_DATA_FILE)
+    except FileNotFoundError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _unwrap_hash(hash):
+    """register_user writes the bytes repr (b'$2b$...'); keep just the hash text."""
+    if hash.startswith("b'") and hash.endswith("'"):
+        return hash[2:-1]
+    return hash
+
+
+def _load_user_index():
+    """Return the username -> hash index, re-reading the file only if it changed."""
+    global _user_index, _index_stamp
+    stamp = _file_stamp()
+    if stamp != _index_stamp:
+        index = {}
+        if stamp is not None:
+            with open(USER_DATA_FILE, "r") as f:
+                for line in f:
+                    line = line.strip()
+                    if ',' not in line:
+                        continue
+                    user, hash = line.split(',', 1)
+                    # first entry wins, same as the old line-by-line search
+                    index.setdefault(user, _unwrap_hash(hash))
+        _user_index, _index_stamp = index, stamp
+    return _user_index
+
+
 def register_user(username, password): 
     """Register a new user.""" 
+    global _index_stamp
     hashed_password = hash_password(password) 
-    with open("users.txt", "a") as f: 
+    index_was_current = _index_stamp == _file_stamp()
+    with open(USER_DATA_FILE, "a") as f: 
                 f.write(f"{username},{hashed_password}\n") 
+    # Update the index in place instead of re-reading the file on next login
+    if index_was_current:
+        _user_index.setdefault(username, hashed_password.decode('utf-8'))
+        _index_stamp = _file_stamp()
     print(f"User '{username}' registered.")
 
 
 def login_user(username, password): 
     """Log in an existing user."""
-    with open("users.txt", "r") as f: 
-        for line in f.readlines(): 
-                    user, hash = line.strip().split(',', 1) 
-                    if user == username:
-                        return verify_password(password, hash) 
-    return False
+    hash = _load_user_index().get(username)
+    if hash is None:
+        return False
+    return verify_password(password, hash)
 
 
 """# TEMPORARY TEST CODE - Remove after testing